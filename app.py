@@ -2,9 +2,8 @@
 import json
 import os
 import time
-from functools import wraps
+from functools import partial, wraps
 import asyncio
-import signal
 # Third-party library imports
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, status
@@ -17,6 +16,7 @@ from apiKeysDatabase import ApiKeysDatabase
 from techniques.EquivalencePartition import EquivalencePartition
 from techniques.LimitValueAnalysis import LimitValueAnalysis
 from techniques.OrthogonalArray import OrthogonalArray
+from techniques.CoveringArray import CoveringArray
 
 import smtplib
 from email.mime.text import MIMEText
@@ -29,6 +29,8 @@ db_port = os.getenv("DB_PORT")
 db_name = os.getenv("DB_NAME")
 db_user = os.getenv("DB_USER")
 db_password = os.getenv("DB_PASSWORD")
+pe_workers = int(os.getenv("PE_WORKERS", "1"))
+lva_time_budget = float(os.getenv("AVL_TIME_BUDGET", LimitValueAnalysis.MAX_TIME))
 
 # Initialize API keys database
 apikeys = ApiKeysDatabase(
@@ -95,11 +97,19 @@ async def process_request(request: Request):
 
         parameters = dict(parameters)
         if technique == 'PE':
-            test_cases = EquivalencePartition(parameters).build_test_cases()
+            mode = data.get('modo', 'completo')
+            strength = data.get('fuerza', CoveringArray.DEFAULT_STRENGTH)
+            compact = data.get('formato', 'extendido') == 'compacto'
+            sample_size, seed = data.get('muestras'), data.get('semilla')
+            build_test_cases = partial(EquivalencePartition(parameters).build_test_cases, mode=mode, strength=strength, compact=compact, workers=pe_workers,
+                                       sample_size=sample_size, seed=seed)
+            test_cases = await asyncio.get_running_loop().run_in_executor(None, build_test_cases)
         elif technique == 'AVL':
-            test_cases = LimitValueAnalysis(parameters).build_test_cases()
+            strategy = data.get('estrategia', 'estandar')
+            build_test_cases = partial(LimitValueAnalysis(parameters).build_test_cases, strategy=strategy, time_budget=lva_time_budget)
+            test_cases = await asyncio.get_running_loop().run_in_executor(None, build_test_cases)
         elif technique == 'AO':
-            test_cases = OrthogonalArray(parameters).build_test_cases()
+            test_cases = await asyncio.get_running_loop().run_in_executor(None, OrthogonalArray(parameters).build_test_cases)
         else:
             raise Exception(f'No se encontró la técnica: {technique}.')
         
@@ -110,7 +120,49 @@ async def process_request(request: Request):
             'tiempo-transcurrido' : '{:.5f}'.format(time.time() - start_time)
         }
     except Exception as e:
-        signal.alarm(0)
+        response = {
+            'error' : True,
+            'mensaje': str(e),
+            'tiempo-transcurrido' : '{:.5f}'.format(time.time() - start_time)
+        }
+
+    return JSONResponse(content=response, status_code=status.HTTP_200_OK)
+
+
+@app.post('/api/estimate')
+@api_key_required
+async def estimate_request(request: Request):
+
+    start_time = time.time()
+
+    try:
+        data =  await request.json()
+        technique = data.get('tecnica', '')
+        parameters = data.get('parametros', '')
+
+        parameters = dict(parameters)
+        if technique == 'PE':
+            mode = data.get('modo', 'completo')
+            strength = data.get('fuerza', CoveringArray.DEFAULT_STRENGTH)
+            compact = data.get('formato', 'extendido') == 'compacto'
+            sample_size = data.get('muestras')
+            estimate = partial(EquivalencePartition(parameters).estimate, mode=mode, strength=strength, compact=compact, sample_size=sample_size)
+            estimate = await asyncio.get_running_loop().run_in_executor(None, estimate)
+        elif technique == 'AVL':
+            estimate = partial(LimitValueAnalysis(parameters).estimate, strategy=data.get('estrategia', 'estandar'))
+            estimate = await asyncio.get_running_loop().run_in_executor(None, estimate)
+        elif technique == 'AO':
+            estimate = await asyncio.get_running_loop().run_in_executor(None, OrthogonalArray(parameters).estimate)
+        else:
+            raise Exception(f'No se encontró la técnica: {technique}.')
+
+        response = {
+            'error' : False,
+            'tecnica': technique,
+            'estimacion': estimate,
+            'tiempo-transcurrido' : '{:.5f}'.format(time.time() - start_time)
+        }
+    except Exception as e:
         response = {
             'error' : True,
             'mensaje': str(e),
@@ -0,0 +1,11 @@
+# encoding: utf-8
+
+from .__version__ import (
+    __author__,
+    __author_email__,
+    __license__,
+    __maintainer__,
+    __maintainer_email__,
+    __version__,
+)
+from .coveringArray import CoveringArray
\ No newline at end of file
@@ -0,0 +1,8 @@
+# encoding: utf-8
+
+__author__ = "Geiler Hipia | Alejandro Beltran"
+__author_email__ = "geilerhipiamejia0@hotmail.com | alejobz@gmail.com"
+__maintainer__ = "Geiler | Alejrando"
+__maintainer_email__ = ""
+__license__ = "MIT License"
+__version__ = "0.0.1"
@@ -0,0 +1,223 @@
+import time
+from collections import Counter
+from itertools import combinations, product
+
+
+class CoveringArray:
+
+    """
+    Construye arreglos de cubrimiento de fuerza t con la estrategia IPOG (In-Parameter-Order-General).
+
+    Un arreglo de cubrimiento de fuerza t garantiza que toda combinación de valores de cualquier
+    grupo de t parámetros aparece en al menos una fila. A diferencia del producto cartesiano,
+    el número de filas crece de forma polinomial con el número de parámetros.
+
+    Opcionalmente se pueden declarar pares de valores incompatibles: las filas del arreglo nunca
+    los contienen y se cubren todas las combinaciones de t valores que aparecen en alguna fila permitida.
+
+    Attributes:
+    -----------
+    DEFAULT_STRENGTH : int
+        La fuerza por defecto (todos los pares).
+    """
+
+    DEFAULT_STRENGTH : int = 2
+
+    def __init__(self, levels : list, strength : int = DEFAULT_STRENGTH, conflicts : dict = None):
+        """
+        Inicializa el constructor del arreglo de cubrimiento.
+
+        Args:
+        ------
+        levels : list
+            El número de valores (niveles) de cada parámetro, en el orden de las columnas de salida.
+        strength : int
+            La fuerza t del arreglo. Si hay menos de t parámetros se genera el producto completo.
+        conflicts : dict
+            Opcional. Un diccionario simétrico (parametro, valor) -> conjunto de (parametro, valor)
+            incompatibles, con los parámetros por su posición y los valores por su índice (base 0).
+
+        Raises:
+        -------
+        ValueError : Si los niveles o la fuerza no son válidos.
+        """
+        if type(strength) != int or strength < 1:
+            raise ValueError(f'La fuerza del arreglo de cubrimiento debe ser un entero positivo ({strength}).')
+        for level in levels:
+            if type(level) != int or level < 0:
+                raise ValueError(f'El número de niveles debe ser un entero no negativo ({level}).')
+
+        self.__levels = list(levels)
+        self.__strength = strength
+        self.__conflicts = conflicts or {}
+
+    def build_indexes(self, time_budget : float = None, max_time : float = None):
+        """
+        Construye el arreglo de cubrimiento.
+
+        Los parámetros se procesan de mayor a menor número de niveles, lo que suele producir
+        arreglos más pequeños, y al final se reordenan las columnas al orden original.
+
+        Args:
+        ------
+        time_budget : float
+            Opcional. Si se indica, después de construir el arreglo se eliminan, durante a lo sumo
+            ese número de segundos, las filas cuyas combinaciones ya cubren otras filas.
+        max_time : float
+            Opcional. El número máximo de segundos para construir el arreglo (sin contar la mejora).
+
+        Returns:
+        --------
+        rows : list
+            Una lista de filas, donde cada fila es una lista con el índice (base 0) del valor
+            elegido para cada parámetro.
+
+        Raises:
+        -------
+        TimeoutError : Si la construcción tarda más de `max_time` segundos.
+        """
+        deadline = None if max_time is None else time.monotonic() + max_time
+        n = len(self.__levels)
+        if 0 in self.__levels:
+            return []
+
+        order = sorted(range(n), key=lambda column: self.__levels[column], reverse=True)
+        levels = [self.__levels[column] for column in order]
+        t = min(self.__strength, n)
+        position = {column : index for index, column in enumerate(order)}
+        conflicts = {
+            (position[column], value) : {(position[other], other_value) for other, other_value in others}
+            for (column, value), others in self.__conflicts.items()
+        }
+
+        rows = [list(row) for row in product(*[range(level) for level in levels[:t]])]
+        if conflicts:
+            rows = [row for row in rows if self.__complete(row, levels, conflicts) is not None]
+        first_incomplete = len(rows)
+        for column in range(t, n):
+            self.__extend(rows, levels, column, t, first_incomplete, conflicts, deadline)
+
+        # Los valores que no importan se fijan en el primer valor del parámetro que es compatible con la fila
+        if conflicts:
+            rows = [self.__complete(row, levels, conflicts) for row in rows]
+        rows = [[row[position[column]] or 0 for column in range(n)] for row in rows]
+        if time_budget is not None:
+            rows = self.__remove_redundant_rows(rows, t, time.monotonic() + time_budget)
+        return rows
+
+    def __remove_redundant_rows(self, rows, t, deadline):
+        """
+        Elimina, de la última a la primera y hasta alcanzar el plazo, las filas en las que cada
+        combinación de t valores aparece también en otra fila.
+        """
+        groups = list(combinations(range(len(self.__levels)), t))
+        tuples = lambda row: [(columns, tuple(row[column] for column in columns)) for columns in groups]
+        counts = Counter(item for row in rows for item in tuples(row))
+
+        kept = []
+        for row in reversed(rows):
+            items = tuples(row)
+            if time.monotonic() < deadline and all(counts[item] > 1 for item in items):
+                counts.subtract(items)
+            else:
+                kept.append(row)
+        return kept[::-1]
+
+    def __extend(self, rows, levels, column, t, first_incomplete, conflicts, deadline):
+        """
+        Agrega la columna `column` al arreglo con crecimiento horizontal (se elige el valor de la
+        nueva columna para cada fila existente) y vertical (se agregan filas para las combinaciones
+        que aún no están cubiertas). Solo las filas desde `first_incomplete` pueden tener valores
+        sin asignar (None).
+
+        Si hay conflictos, las combinaciones que no aparecen en ninguna fila permitida no se
+        consideran y cada fila se mantiene completable (ver `__complete`) después de cada cambio.
+        """
+        fits = lambda row: not conflicts or self.__complete(row, levels, conflicts) is not None
+
+        uncovered = {}
+        for columns in combinations(range(column), t - 1):
+            uncovered[columns] = set(product(*[range(levels[other]) for other in columns + (column,)]))
+            if conflicts:
+                uncovered[columns] = set(values for values in uncovered[columns] if fits(self.__partial_row(column + 1, columns + (column,), values)))
+
+        # Crecimiento horizontal
+        for row in rows:
+            self.__check_deadline(deadline)
+            scores = []
+            for value in range(levels[column]):
+                covered = 0
+                for columns, tuples in uncovered.items():
+                    if tuple(row[other] for other in columns) + (value,) in tuples:
+                        covered += 1
+                scores.append((-covered, value))
+            best_value = next(value for _, value in sorted(scores) if fits(row + [value]))
+            row.append(best_value)
+            for columns, tuples in uncovered.items():
+                tuples.discard(tuple(row[other] for other in columns) + (best_value,))
+
+        # Crecimiento vertical: las filas nuevas dejan en None los valores que no importan
+        for columns, tuples in uncovered.items():
+            self.__check_deadline(deadline)
+            columns = columns + (column,)
+            for values in sorted(tuples):
+                for row in rows[first_incomplete:]:
+                    if all(row[other] is None or row[other] == value for other, value in zip(columns, values)):
+                        candidate = list(row)
+                        for other, value in zip(columns, values):
+                            candidate[other] = value
+                        if fits(candidate):
+                            break
+                else:
+                    row = [None] * (column + 1)
+                    rows.append(row)
+                for other, value in zip(columns, values):
+                    row[other] = value
+
+    def __check_deadline(self, deadline):
+        """
+        Lanza TimeoutError si se alcanzó el plazo de construcción.
+        """
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError('Se agotó el tiempo para construir el arreglo de cubrimiento.')
+
+    def __partial_row(self, size, columns, values):
+        """
+        Retorna una fila de `size` columnas con `values` en `columns` y None en las demás.
+        """
+        row = [None] * size
+        for column, value in zip(columns, values):
+            row[column] = value
+        return row
+
+    def __complete(self, row, levels, conflicts):
+        """
+        Completa una fila parcial (con None en los valores sin asignar y sin las últimas columnas)
+        a una fila de todos los parámetros sin pares incompatibles, eligiendo para cada valor
+        faltante el primero que lo permite, con búsqueda en profundidad.
+
+        Returns:
+        --------
+        row : list | None
+            La fila completa, o None si los valores asignados no aparecen en ninguna fila permitida.
+        """
+        row = list(row) + [None] * (len(levels) - len(row))
+        compatible = lambda column, value: all(row[other] != other_value for other, other_value in conflicts.get((column, value), ()))
+        if not all(value is None or compatible(column, value) for column, value in enumerate(row)):
+            return None
+
+        free = [column for column, value in enumerate(row) if value is None]
+
+        def assign(position):
+            if position == len(free):
+                return True
+            column = free[position]
+            for value in range(levels[column]):
+                if compatible(column, value):
+                    row[column] = value
+                    if assign(position + 1):
+                        return True
+            row[column] = None
+            return False
+
+        return row if assign(0) else None
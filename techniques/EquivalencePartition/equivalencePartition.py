@@ -1,6 +1,47 @@
+import json
+import multiprocessing
+import random
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+from ..CoveringArray.coveringArray import CoveringArray
+
 
 class EquivalencePartition(object):
 
+    """
+    Attributes:
+    -----------
+    MODES : tuple
+        Los modos de generación de casos válidos: 'completo' (producto cartesiano de las clases
+        válidas), 'combinatorio' (arreglo de cubrimiento de fuerza t) y 'muestreo' (una muestra
+        aleatoria reproducible del producto).
+    CONSTRAINTS : tuple
+        Las claves opcionales de una clase de equivalencia que restringen las combinaciones:
+        'excluye' (clases de otros parámetros que no pueden combinarse con ella) y 'requiere'
+        (clases de otros parámetros que son las únicas que pueden combinarse con ella).
+    PARALLEL_MIN_CASES : int
+        El número mínimo de casos válidos para generar el producto en varios procesos. Por debajo
+        de este valor el costo de crear los procesos es mayor que la ganancia.
+    SHARDS_PER_WORKER : int
+        El número mínimo de fragmentos del producto por proceso, para repartir mejor la carga.
+    SAMPLE_MAX_ATTEMPTS : int
+        El número máximo de índices sorteados por caso pedido en el modo 'muestreo' cuando hay
+        restricciones. Si no alcanza, se muestrea sobre las combinaciones permitidas.
+    COUNT_MAX_STEPS : int
+        El número máximo de pasos para contar las combinaciones permitidas cuando hay restricciones.
+        Si no alcanza, `count` retorna el producto sin restricciones como cota superior.
+    """
+
+    MODES : tuple = ('completo', 'combinatorio', 'muestreo')
+    CONSTRAINTS : tuple = ('excluye', 'requiere')
+    PARALLEL_MIN_CASES : int = 50000
+    SHARDS_PER_WORKER : int = 4
+    SAMPLE_MAX_ATTEMPTS : int = 20
+    COUNT_MAX_STEPS : int = 200000
+
     def __init__(self, parameters : dict):
         """
         Constructor de la clase EquivalencePartition.
@@ -23,6 +64,11 @@ class EquivalencePartition(object):
                                         ...
                                         'equivalencia_n': {'valido': bool, 'representante': valor}, ... }
 
+            Cada clase puede declarar además restricciones sobre otros parámetros:
+            {'valido': bool, 'representante': valor,
+             'excluye': {'nombre_de_parametro': ['equivalencia_1', ...]},
+             'requiere': {'nombre_de_parametro': ['equivalencia_1', ...]}}
+
         Raises:
         -------
         Exception : Si se encuentra un error en los parámetros proporcionados.
@@ -34,9 +80,18 @@ class EquivalencePartition(object):
         self.__n = len(parameters)
 
         self.__valid_parameters()
+
+        self.__classes = {
+            attribute : [(index, class_name, class_value) for index, (class_name, class_value) in enumerate(classes.items())]
+            for attribute, classes in self.__parameters.items()
+        }
+        self.__valid_classes = [self.__indexed_classes(attribute, valid=True) for attribute in self.__attribute_names]
+        self.__invalid_classes = [self.__indexed_classes(attribute, valid=False) for attribute in self.__attribute_names]
+        self.__conflicts = self.__build_conflicts()
         
     
-    def build_test_cases(self):
+    def build_test_cases(self, mode : str = 'completo', strength : int = CoveringArray.DEFAULT_STRENGTH, compact : bool = False, workers : int = 1,
+                         sample_size : int = None, seed = None):
         
         """
         Genera una lista de casos de prueba válidos e inválidos para la combinación de parámetros
@@ -46,6 +101,21 @@ class EquivalencePartition(object):
         ------
         self : obj
             La instancia actual de la clase.
+        mode : str
+            'completo' genera todas las combinaciones de clases válidas. 'combinatorio' genera
+            solo las necesarias para cubrir todas las combinaciones de `strength` parámetros.
+            'muestreo' genera `sample_size` combinaciones distintas elegidas al azar.
+        strength : int
+            La fuerza t del modo 'combinatorio'.
+        compact : bool
+            Si es verdadero se retorna el formato compacto descrito en `__build_compact_test_cases`.
+        workers : int
+            El número de procesos con los que se genera el producto de casos válidos en el modo
+            'completo' (ver `__build_valid_test_cases_parallel`).
+        sample_size : int
+            El número de casos válidos del modo 'muestreo'. Los casos inválidos siempre se generan todos.
+        seed : int
+            La semilla del modo 'muestreo'. La misma semilla produce la misma muestra.
 
         Returns:
         --------
@@ -80,9 +150,33 @@ class EquivalencePartition(object):
         """
 
 
-        valid_test_cases = self.__generate_valid_test_cases()
-        invalid_test_cases = self.__generate_invalid_test_cases()
-        tests = {'casos_validos' : valid_test_cases, 'casos_invalidos' : invalid_test_cases}
+        if mode not in EquivalencePartition.MODES:
+            raise ValueError(f'Modo desconocido: {mode}. Los modos disponibles son {EquivalencePartition.MODES}.')
+        if type(workers) != int or workers < 1:
+            raise ValueError(f'El número de procesos debe ser un entero positivo ({workers}).')
+
+        if mode == 'combinatorio':
+            rows = self.__covering_rows(strength)
+            candidates, valid_items = len(rows), self.__iter_covering_items(rows)
+        elif mode == 'muestreo':
+            candidates, valid_items = None, self.__sample_items(sample_size, seed)
+        else:
+            candidates, valid_items = self.__product_size(), self.__iter_valid_items()
+
+        parallel = workers > 1 and mode == 'completo' and not self.__conflicts and candidates >= EquivalencePartition.PARALLEL_MIN_CASES
+
+        if compact:
+            tests = self.__build_compact_test_cases(valid_items)
+        else:
+            if parallel:
+                valid_test_cases = self.__build_valid_test_cases_parallel(workers)
+            else:
+                valid_test_cases = [self.__build_case(self.__attribute_names, items) for items in valid_items]
+            invalid_test_cases = list(self.iter_invalid_cases())
+            tests = {'casos_validos' : valid_test_cases, 'casos_invalidos' : invalid_test_cases}
+
+        if self.__conflicts and candidates is not None:
+            tests['casos_descartados'] = candidates - len(tests['casos_validos'])
 
         return tests
 
@@ -108,79 +202,661 @@ class EquivalencePartition(object):
                     assert type(equiv_class['valido']) == bool, f'El tipo "es valido: de `{equiv_class_name}` no es un boolean.'
                     assert equiv_class.get('representante') != None, f'El valor de `{equiv_class_name}` es None.'
                     assert equiv_class['representante'] != "", f'El valor de `{equiv_class_name}` es vacio.'
+                    for constraint in EquivalencePartition.CONSTRAINTS:
+                        self.__valid_constraint(var, equiv_class_name, constraint, equiv_class.get(constraint, {}))
             except AssertionError as e:
                 raise AssertionError(F'Error en `{var}`: {e}')
 
-    def __generate_valid_test_cases(self): 
-        
+    def __valid_constraint(self, var, equiv_class_name, constraint, value):
+        """
+        Valida que una restricción ('excluye' o 'requiere') de una clase de equivalencia haga
+        referencia a clases existentes de otros parámetros.
+
+        Raises:
+        -------
+        AssertionError : Si la restricción no tiene el formato esperado.
+        """
+        assert type(value) == dict, f'La restricción "{constraint}" de `{equiv_class_name}` no es un diccionario.'
+        for other, class_names in value.items():
+            assert other != var, f'La restricción "{constraint}" de `{equiv_class_name}` hace referencia a su propio parámetro.'
+            assert other in self.__parameters, f'La restricción "{constraint}" de `{equiv_class_name}` hace referencia al parámetro desconocido `{other}`.'
+            assert type(class_names) == list, f'Las clases de `{other}` en la restricción "{constraint}" de `{equiv_class_name}` no son una lista.'
+            for class_name in class_names:
+                assert class_name in self.__parameters[other], f'La restricción "{constraint}" de `{equiv_class_name}` hace referencia a la clase desconocida `{other}.{class_name}`.'
+
+    def __build_conflicts(self):
+        """
+        Traduce las restricciones declaradas a pares de clases incompatibles. 'excluye' prohíbe
+        las clases listadas y 'requiere' prohíbe todas las clases del otro parámetro que no están
+        listadas.
+
+        Returns:
+        --------
+        conflicts : dict
+            Un diccionario simétrico (posición_parametro, indice_clase) -> conjunto de
+            (posición_parametro, indice_clase) incompatibles.
+        """
+        positions = {attribute : position for position, attribute in enumerate(self.__attribute_names)}
+        conflicts = {}
+        for position, attribute in enumerate(self.__attribute_names):
+            for index, _, class_value in self.__classes[attribute]:
+                for constraint in EquivalencePartition.CONSTRAINTS:
+                    for other, class_names in class_value.get(constraint, {}).items():
+                        for other_index, other_name, _ in self.__classes[other]:
+                            if (other_name in class_names) == (constraint == 'excluye'):
+                                conflicts.setdefault((position, index), set()).add((positions[other], other_index))
+                                conflicts.setdefault((positions[other], other_index), set()).add((position, index))
+        return conflicts
+
+    def __is_compatible(self, position, index, chosen):
         """
-        Esta función genera una lista de casos de prueba válidos para la combinación de parámetros
+        Verifica que la clase `index` del parámetro en la posición `position` sea compatible con las
+        clases ya elegidas para los parámetros anteriores (`chosen`, lista de tuplas de clase).
+        """
+        for other, other_index in self.__conflicts.get((position, index), ()):
+            if other < position and chosen[other][0] == other_index:
+                return False
+        return True
+
+    def __indexed_classes(self, attribute, valid):
+        """
+        Retorna las clases de equivalencia de un atributo filtradas por su validez, junto con
+        su indice dentro del diccionario original. El indice se usa como clave canonica de los
+        casos de prueba para evitar comparar diccionarios completos.
+
+        Args:
+        ------
+        attribute : str
+            Nombre del parametro.
+        valid : bool
+            Si se deben retornar las clases validas o las invalidas.
+
+        Returns:
+        --------
+        items : list
+            Una lista de tuplas (indice, nombre_clase, clase).
+        """
+        return [item for item in self.__classes[attribute] if item[2]['valido'] == valid]
+
+    def __build_case(self, attributes, items):
+        """
+        Construye el diccionario de un caso de prueba a partir de las clases elegidas para cada atributo.
+
+        Args:
+        ------
+        attributes : list
+            Los nombres de los parametros en el orden de salida.
+        items : iterable
+            Las tuplas (indice, nombre_clase, clase) elegidas para cada parametro.
+
+        Returns:
+        --------
+        case : dict
+            El caso de prueba con el formato descrito en `build_test_cases`.
+        """
+        return {
+            attribute : {'clase_equivalencia' : class_name, 'representante' : class_value['representante']}
+            for attribute, (_, class_name, class_value) in zip(attributes, items)
+        }
+
+    def iter_valid_cases(self, start : int = 0, stop : int = None):
+        """
+        Genera, uno a uno, los casos de prueba válidos para la combinación de parámetros
         especificados en el diccionario de parámetros de la instancia actual. Los casos de prueba
         válidos son aquellos que tienen valores válidos para cada parámetro de entrada según lo
         especificado en el diccionario de parámetros.
-        
+
+        Los casos se producen en el mismo orden que `build_test_cases` y solo se mantiene en memoria
+        la combinación actual, por lo que el consumo de memoria depende del número de parámetros y
+        no del número de casos. Como los nombres de las clases de un parámetro son únicos, el producto
+        no contiene casos repetidos y no es necesario deduplicar.
+
         Args:
         ------
-        self : obj
-            La instancia actual de la clase.
+        start : int
+            Índice del primer caso a generar. El caso inicial se obtiene directamente con
+            `get_valid_case`, sin recorrer los anteriores.
+        stop : int
+            Índice (exclusivo) del último caso a generar. Por defecto se generan todos.
+
+        Yields:
+        --------
+        case : dict
+            Un diccionario que representa un caso de prueba válido.
+        """
+        for items in self.__iter_valid_items(start, stop):
+            yield self.__build_case(self.__attribute_names, items)
+
+    def __iter_valid_items(self, start : int = 0, stop : int = None):
+        """
+        Recorre el producto de clases válidas como un odómetro de base mixta, desde `start` hasta
+        `stop`, y retorna para cada caso la lista de tuplas (indice, nombre_clase, clase) elegidas.
+        Si hay restricciones se recorre con `__iter_constrained_items`.
+        """
+        if self.__conflicts:
+            if start < 0 or (stop is not None and stop < 0):
+                raise ValueError(f'Los indices deben ser positivos ({start}, {stop}).')
+            yield from islice(self.__iter_constrained_items(), start, stop)
+            return
+
+        total = self.__product_size()
+        stop = total if stop is None else min(stop, total)
+        if start < 0 or stop < 0:
+            raise ValueError(f'Los indices deben ser positivos ({start}, {stop}).')
+        if start >= stop:
+            return
+
+        radices = [len(classes) for classes in self.__valid_classes]
+        digits = self.__unrank(start, radices)
+        for _ in range(start, stop):
+            yield [classes[digit] for classes, digit in zip(self.__valid_classes, digits)]
+            position = self.__n - 1
+            while position >= 0:
+                digits[position] += 1
+                if digits[position] < radices[position]:
+                    break
+                digits[position] = 0
+                position -= 1
+
+    def __iter_constrained_items(self):
+        """
+        Recorre en profundidad el producto de clases válidas, en el mismo orden que el odómetro,
+        verificando las restricciones en cada nivel. Cuando una clase es incompatible con las ya
+        elegidas se descarta todo el subárbol de combinaciones que empieza con ella.
+        """
+        chosen = [None] * self.__n
+
+        def generate_combinations(position):
+            if position == self.__n:
+                yield list(chosen)
+                return
+            for item in self.__valid_classes[position]:
+                if self.__is_compatible(position, item[0], chosen):
+                    chosen[position] = item
+                    yield from generate_combinations(position + 1)
+
+        yield from generate_combinations(0)
+
+    def iter_covering_cases(self, strength : int = CoveringArray.DEFAULT_STRENGTH):
+        """
+        Genera los casos de prueba válidos de un arreglo de cubrimiento de fuerza t: toda
+        combinación de clases válidas de cualquier grupo de t parámetros aparece en al menos
+        un caso, con muchos menos casos que el producto cartesiano.
+
+        Args:
+        ------
+        strength : int
+            La fuerza t del arreglo de cubrimiento.
+
+        Yields:
+        --------
+        case : dict
+            Un diccionario que representa un caso de prueba válido.
+        """
+        for items in self.__iter_covering_items(self.__covering_rows(strength)):
+            yield self.__build_case(self.__attribute_names, items)
+
+    def __sample_items(self, size, seed):
+        """
+        Elige `size` combinaciones distintas de clases válidas, de manera uniforme y reproducible,
+        sin recorrer el producto: se sortean índices y se obtienen sus clases con `__unrank`.
+        Si hay restricciones, los índices incompatibles se descartan y se sortean otros.
+
+        Args:
+        ------
+        size : int
+            El número de combinaciones. Si es mayor que el número de combinaciones válidas se retornan todas.
+        seed : int
+            La semilla del generador de números aleatorios.
+
+        Returns:
+        --------
+        items : list
+            Las combinaciones elegidas, en el mismo orden que en el producto completo.
+        """
+        if type(size) != int or size < 0:
+            raise ValueError(f'El tamaño de la muestra debe ser un entero no negativo ({size}).')
+
+        rng = random.Random(seed)
+        total = self.__product_size()
+        radices = [len(classes) for classes in self.__valid_classes]
+        unrank = lambda index: [classes[digit] for classes, digit in zip(self.__valid_classes, self.__unrank(index, radices))]
+
+        if not self.__conflicts:
+            if size >= total:
+                return list(self.__iter_valid_items())
+            if total <= sys.maxsize:
+                indexes = rng.sample(range(total), size)
+            else:
+                indexes = set()
+                while len(indexes) < size:
+                    indexes.add(rng.randrange(total))
+            return [unrank(index) for index in sorted(indexes)]
+
+        chosen, rejected = {}, set()
+        for _ in range(size * EquivalencePartition.SAMPLE_MAX_ATTEMPTS):
+            if len(chosen) == size:
+                return [chosen[index] for index in sorted(chosen)]
+            index = rng.randrange(total) if total else 0
+            if index in chosen or index in rejected:
+                continue
+            items = unrank(index)
+            if all(self.__is_compatible(position, item[0], items) for position, item in enumerate(items)):
+                chosen[index] = items
+            else:
+                rejected.add(index)
+
+        if len(chosen) == size:
+            return [chosen[index] for index in sorted(chosen)]
+
+        # Hay pocas combinaciones permitidas: se muestrea directamente sobre ellas.
+        allowed = list(self.__iter_constrained_items())
+        if size >= len(allowed):
+            return allowed
+        return [allowed[index] for index in sorted(rng.sample(range(len(allowed)), size))]
+
+    def __build_valid_test_cases_parallel(self, workers):
+        """
+        Genera el producto de casos válidos en varios procesos. El producto se divide por los
+        valores de los primeros parámetros: cada combinación de clases de esos parámetros es un
+        bloque contiguo de índices que un proceso genera con `iter_valid_cases(start, stop)`.
+        Los bloques se unen en orden, por lo que el resultado es igual al secuencial; la única
+        diferencia es que los casos de un mismo bloque comparten los diccionarios de las celdas.
+
+        Los procesos no se crean con 'fork': este método se llama desde hilos del servidor y un
+        proceso copiado de uno con varios hilos puede heredar candados tomados por otro hilo (por
+        ejemplo el del caché de límites o los de logging) y bloquearse.
+
+        Args:
+        ------
+        workers : int
+            El número de procesos.
 
         Returns:
         --------
         test_cases : list
-            Una lista de diccionarios que representan casos de prueba válidos para la combinación de
-            parámetros especificados en el diccionario de parámetros de la instancia actual.
+            La lista de casos de prueba válidos.
         """
-            
+        shards, position = 1, 0
+        while position < self.__n and shards < workers * EquivalencePartition.SHARDS_PER_WORKER:
+            shards *= len(self.__valid_classes[position])
+            position += 1
+        block = self.__product_size() // shards
+
+        starts = [shard * block for shard in range(shards)]
+        stops = [start + block for start in starts]
         test_cases = []
-        def generate_combinations(remaining_attributes, current_combination):
-            if not remaining_attributes:
-                if current_combination not in test_cases:
-                    test_cases.append(current_combination)
-            else:
-                current_attribute = remaining_attributes[0]
-                items = list(filter(lambda x: x[1]['valido'] == True, self.__parameters[current_attribute].items()))
-                for class_equivalent, class_value in items: 
-                    new_combination = current_combination.copy()
-                    new_combination[current_attribute] = {'clase_equivalencia' : class_equivalent, 'representante' : class_value['representante']}
-                    generate_combinations(remaining_attributes[1:], new_combination)
-                     
-        generate_combinations(self.__attribute_names, {})
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as executor:
+            for shard in executor.map(_build_valid_shard, repeat(self.__parameters), starts, stops):
+                test_cases.extend(shard)
         return test_cases
 
-    def __generate_invalid_test_cases(self):
+    def __covering_rows(self, strength):
+        """
+        Construye el arreglo de cubrimiento de las clases válidas. Las restricciones se traducen a
+        conflictos entre índices de clases válidas, de modo que el arreglo solo contiene
+        combinaciones permitidas y cubre todas las combinaciones de t clases que aparecen en alguna de ellas.
+        """
+        levels = [len(classes) for classes in self.__valid_classes]
+        digits = [{item[0] : digit for digit, item in enumerate(classes)} for classes in self.__valid_classes]
+        conflicts = {}
+        for (position, index), others in self.__conflicts.items():
+            if index in digits[position]:
+                conflicts[(position, digits[position][index])] = {
+                    (other, digits[other][other_index]) for other, other_index in others if other_index in digits[other]
+                }
+        return CoveringArray(levels, strength, conflicts).build_indexes()
+
+    def __iter_covering_items(self, rows):
         """
-        Esta función genera una lista de casos de prueba inválidos para la combinación de parámetros
+        Traduce las filas del arreglo de cubrimiento a clases válidas.
+        """
+        for row in rows:
+            yield [classes[digit] for classes, digit in zip(self.__valid_classes, row)]
+
+    def iter_invalid_cases(self):
+        """
+        Genera, uno a uno, los casos de prueba inválidos para la combinación de parámetros
         especificados en el diccionario de parámetros de la instancia actual. Los casos de prueba
         inválidos son aquellos que tienen valores inválidos para al menos uno de los parámetros de
-        entrada según lo especificado en el diccionario de parámetros.
-        
-        Return:
+        entrada según lo especificado en el diccionario de parámetros. Cada clase invalida se combina
+        con la primera clase valida compatible de los otros parametros.
+
+        Se genera exactamente un caso por clase inválida, en una sola pasada y sin modificar el
+        estado de la instancia, por lo que el costo es lineal en el número de clases inválidas.
+
+        Yields:
         --------
-        test_cases : list
-            Una lista de diccionarios que representan casos de prueba inválidos para la combinación de
-            parámetros especificados en el diccionario de parámetros de la instancia actual. Para casa invalido
-            se combina con otros paramatros valiudos
+        case : dict
+            Un diccionario que representa un caso de prueba inválido.
         """
-        test_cases = []
+        for position, classes in enumerate(self.__invalid_classes):
+            for item in classes:
+                yield self.__build_invalid_case(position, self.__invalid_items(position, item))
+
+    def __invalid_items(self, position, item):
+        """
+        Retorna, en el orden original de los parámetros, las clases del caso inválido de la clase
+        `item` del parámetro en la posición `position`. Los demás parámetros toman su primera clase
+        válida compatible con las ya elegidas, para que el caso no combine la clase inválida con
+        una combinación prohibida. Si ninguna es compatible se usa la primera.
+        """
+        items = [None] * self.__n
+        items[position] = item
+        for other, classes in enumerate(self.__valid_classes):
+            if other != position:
+                compatible = lambda candidate: all(items[chosen] is None or items[chosen][0] != index
+                                                   for chosen, index in self.__conflicts.get((other, candidate[0]), ()))
+                items[other] = next(filter(compatible, classes), classes[0])
+        return items
+
+    def __build_invalid_case(self, position, items):
+        """
+        Construye el caso inválido del parámetro en la posición `position`. Las claves del caso
+        empiezan por el parámetro inválido y siguen el orden original de forma circular.
+        """
+        attributes = self.__attribute_names[position:] + self.__attribute_names[:position]
+        return self.__build_case(attributes, items[position:] + items[:position])
+
+    def count(self):
+        """
+        Calcula el número exacto de casos de prueba válidos e inválidos sin generarlos.
+
+        Los válidos son el producto del número de clases válidas de cada parámetro y los
+        inválidos la suma del número de clases inválidas. Si hay restricciones, los válidos se
+        cuentan con `__count_allowed` y se agrega la clave 'casos_descartados'. Si el conteo no
+        termina en `COUNT_MAX_STEPS` pasos, los válidos son el producto sin restricciones (una cota
+        superior) y se agrega la clave 'aproximado'.
 
-        def generate_combinations(remaining_attributes, current_combination, valid):
-            if not remaining_attributes: 
-                if current_combination not in test_cases:
-                    test_cases.append(current_combination)
+        Returns:
+        --------
+        count : dict
+            Un diccionario con las claves 'casos_validos' y 'casos_invalidos'.
+        """
+        n_valids = self.__product_size()
+        n_invalids = sum(len(classes) for classes in self.__invalid_classes)
+        if not self.__conflicts:
+            return {'casos_validos' : n_valids, 'casos_invalidos' : n_invalids}
+
+        n_allowed = self.__count_allowed()
+        if n_allowed is None:
+            return {'casos_validos' : n_valids, 'casos_invalidos' : n_invalids, 'aproximado' : True}
+        return {'casos_validos' : n_allowed, 'casos_invalidos' : n_invalids, 'casos_descartados' : n_valids - n_allowed}
+
+    def __count_allowed(self):
+        """
+        Cuenta las combinaciones permitidas de clases válidas sin recorrerlas. Los parámetros se
+        eligen en orden y solo se recuerdan las clases elegidas que todavía pueden entrar en conflicto
+        con un parámetro posterior, junto con el número de combinaciones que llevan a cada elección.
+        Las clases con los mismos conflictos posteriores se recuerdan como una sola y los parámetros
+        sin restricciones solo multiplican los conteos.
+
+        Returns:
+        --------
+        int | None
+            El número de combinaciones permitidas, o None si se superan `COUNT_MAX_STEPS` pasos.
+        """
+        valid_indexes = [{item[0] for item in classes} for classes in self.__valid_classes]
+        last = list(range(self.__n))
+        for (position, index), others in self.__conflicts.items():
+            if index in valid_indexes[position]:
+                last[position] = max([last[position]] + [other for other, other_index in others if other_index in valid_indexes[other]])
+
+        counts, active, steps = {() : 1}, [], 0
+        for position, classes in enumerate(self.__valid_classes):
+            kept = [slot for slot, other in enumerate(active) if last[other] > position]
+            remember = last[position] > position
+            signatures, representatives = {}, {}
+            for index, _, _ in classes:
+                later = frozenset((other, other_index) for other, other_index in self.__conflicts.get((position, index), ())
+                                  if other > position and other_index in valid_indexes[other])
+                representatives[index] = signatures.setdefault(later, index)
+            next_counts = {}
+            for state, total in counts.items():
+                steps += len(classes)
+                if steps > EquivalencePartition.COUNT_MAX_STEPS:
+                    return None
+                forbidden = {index for slot, other in enumerate(active)
+                             for chosen, index in self.__conflicts.get((other, state[slot]), ()) if chosen == position}
+                allowed = [index for index, _, _ in classes if index not in forbidden]
+                prefix = tuple(state[slot] for slot in kept)
+                if not remember:
+                    next_counts[prefix] = next_counts.get(prefix, 0) + total * len(allowed)
+                    continue
+                for index in allowed:
+                    key = prefix + (representatives[index],)
+                    next_counts[key] = next_counts.get(key, 0) + total
+            active = [active[slot] for slot in kept] + ([position] if remember else [])
+            counts = next_counts
+        return sum(counts.values())
+
+    def estimate(self, mode : str = 'completo', strength : int = CoveringArray.DEFAULT_STRENGTH, compact : bool = False, sample_size : int = None):
+        """
+        Estima el resultado de `build_test_cases` sin construir los casos: el número exacto de casos
+        válidos e inválidos y el tamaño aproximado en bytes de la respuesta JSON. En el modo 'completo'
+        con restricciones el número de válidos puede ser una cota superior (ver `count`).
+
+        El tamaño de cada celda se calcula una sola vez por clase; para el producto completo sin
+        restricciones cada clase de un parámetro aparece el mismo número de veces, por lo que el
+        promedio por clase da un tamaño exacto salvo por los separadores.
+
+        Args:
+        ------
+        mode : str
+            El modo de generación de los casos válidos (ver `build_test_cases`).
+        strength : int
+            La fuerza t del modo 'combinatorio'.
+        compact : bool
+            Si se estima el formato compacto.
+        sample_size : int
+            El número de casos válidos del modo 'muestreo'.
+
+        Returns:
+        --------
+        estimate : dict
+            Un diccionario con las claves 'casos_validos', 'casos_invalidos' y 'bytes', y la clave
+            'aproximado' si el número de válidos es una cota superior.
+        """
+        if mode not in EquivalencePartition.MODES:
+            raise ValueError(f'Modo desconocido: {mode}. Los modos disponibles son {EquivalencePartition.MODES}.')
+
+        approximate = False
+        if mode == 'combinatorio':
+            n_valids = sum(1 for _ in self.__iter_covering_items(self.__covering_rows(strength)))
+        elif mode == 'muestreo':
+            if type(sample_size) != int or sample_size < 0:
+                raise ValueError(f'El tamaño de la muestra debe ser un entero no negativo ({sample_size}).')
+            if self.__conflicts:
+                # Basta con recorrer las combinaciones permitidas hasta alcanzar el tamaño de la muestra
+                n_valids = sum(1 for _ in islice(self.__iter_constrained_items(), sample_size))
             else:
+                n_valids = min(sample_size, self.__product_size())
+        else:
+            count = self.count()
+            n_valids, approximate = count['casos_validos'], count.get('aproximado', False)
+        n_invalids = sum(len(classes) for classes in self.__invalid_classes)
 
-                current_attribute = remaining_attributes[0]
+        if compact:
+            cell_size = lambda position, item: len(str(item[0]))
+            header = {'parametros' : self.__attribute_names, 'clases' : [
+                [{'clase_equivalencia' : class_name, 'representante' : class_value['representante'], 'valido' : class_value['valido']}
+                 for _, class_name, class_value in self.__classes[attribute]]
+                for attribute in self.__attribute_names
+            ]}
+        else:
+            cell_size = lambda position, item: self.__json_size({self.__attribute_names[position] : {
+                'clase_equivalencia' : item[1], 'representante' : item[2]['representante']}}) - 2
+            header = {}
+        header.update({'casos_validos' : [], 'casos_invalidos' : []})
 
-                items = list(filter(lambda x: x[1]['valido'] == valid, self.__parameters[current_attribute].items()))
-                items = items if not valid else [items[0]] 
+        case_size = 2 + max(self.__n - 1, 0)
+        valid_size = case_size
+        first_valid_sizes = []
+        for position, classes in enumerate(self.__valid_classes):
+            sizes = [cell_size(position, item) for item in classes]
+            valid_size += sum(sizes) / len(sizes) if sizes else 0
+            first_valid_sizes.append(sizes[0] if sizes else 0)
 
-                for class_equiv, class_value in items:
-                    new_combination = current_combination.copy()
-                    new_combination[current_attribute] = { 'clase_equivalencia' : class_equiv, 'representante' : class_value['representante'] }
-                    generate_combinations(remaining_attributes[1:], new_combination, valid=True)
+        invalid_bytes = 0
+        for position, classes in enumerate(self.__invalid_classes):
+            others_size = sum(first_valid_sizes) - first_valid_sizes[position]
+            for item in classes:
+                if self.__conflicts:
+                    # Con restricciones los demás parámetros no siempre toman su primera clase válida
+                    items = self.__invalid_items(position, item)
+                    others_size = sum(cell_size(other, items[other]) for other in range(self.__n) if other != position)
+                invalid_bytes += case_size + others_size + cell_size(position, item)
 
-        for _ in range(self.__n):
-            generate_combinations(self.__attribute_names, {}, valid=False)
-            self.__attribute_names = self.__attribute_names[1:] + [self.__attribute_names[0]]
+        total = self.__json_size(header) + n_valids * valid_size + max(n_valids - 1, 0) + invalid_bytes + max(n_invalids - 1, 0)
+        estimate = {'casos_validos' : n_valids, 'casos_invalidos' : n_invalids, 'bytes' : int(round(total))}
+        if approximate:
+            estimate['aproximado'] = True
+        return estimate
 
-        return test_cases
+    def __json_size(self, value):
+        """
+        Retorna el tamaño en bytes de `value` serializado como en la respuesta de la API.
+        """
+        return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    def __product_size(self):
+        """
+        Retorna el tamaño del producto cartesiano de las clases válidas, sin restricciones.
+        """
+        size = 1
+        for classes in self.__valid_classes:
+            size *= len(classes)
+        return size
+
+    def get_valid_case(self, index : int):
+        """
+        Calcula directamente el caso válido número `index` (en el orden de `iter_valid_cases`)
+        interpretando el índice como un número en base mixta, donde la base de cada dígito es el
+        número de clases válidas del parámetro correspondiente. Si hay restricciones, el caso se
+        obtiene recorriendo las combinaciones permitidas.
+
+        Args:
+        ------
+        index : int
+            La posición del caso de prueba.
+
+        Returns:
+        --------
+        case : dict
+            Un diccionario que representa un caso de prueba válido.
+
+        Raises:
+        -------
+        IndexError : Si el índice está fuera del rango de casos válidos.
+        """
+        if self.__conflicts:
+            if index >= 0:
+                for items in self.__iter_valid_items(index, index + 1):
+                    return self.__build_case(self.__attribute_names, items)
+            raise IndexError(f'No existe el caso valido {index}.')
+
+        if not 0 <= index < self.__product_size():
+            raise IndexError(f'No existe el caso valido {index}.')
+        digits = self.__unrank(index, [len(classes) for classes in self.__valid_classes])
+        return self.__build_case(self.__attribute_names, [classes[digit] for classes, digit in zip(self.__valid_classes, digits)])
+
+    def get_invalid_case(self, index : int):
+        """
+        Calcula directamente el caso inválido número `index` (en el orden de `iter_invalid_cases`).
+        Los casos inválidos se agrupan por parámetro, por lo que basta con ubicar el parámetro
+        al que pertenece el índice y fijar los demás en su primera clase válida compatible.
+
+        Args:
+        ------
+        index : int
+            La posición del caso de prueba.
+
+        Returns:
+        --------
+        case : dict
+            Un diccionario que representa un caso de prueba inválido.
+
+        Raises:
+        -------
+        IndexError : Si el índice está fuera del rango de casos inválidos.
+        """
+        if not 0 <= index < sum(len(classes) for classes in self.__invalid_classes):
+            raise IndexError(f'No existe el caso invalido {index}.')
+        position = 0
+        while index >= len(self.__invalid_classes[position]):
+            index -= len(self.__invalid_classes[position])
+            position += 1
+
+        return self.__build_invalid_case(position, self.__invalid_items(position, self.__invalid_classes[position][index]))
+
+    def __unrank(self, index, radices):
+        """
+        Descompone un índice en dígitos de base mixta. El último dígito es el que varía más rápido.
+        """
+        digits = [0] * len(radices)
+        for position in range(len(radices) - 1, -1, -1):
+            index, digits[position] = divmod(index, radices[position])
+        return digits
+
+    def __build_compact_test_cases(self, valid_items):
+        """
+        Construye el resultado en formato compacto (por columnas). En lugar de repetir en cada caso
+        el nombre del parámetro y de la clase, se retorna una tabla de clases por parámetro y cada
+        caso es una fila con el índice de la clase elegida para cada parámetro. Los índices se
+        guardan en un `array` plano (fila por fila) en lugar de un diccionario por celda, y solo se
+        dividen en filas al final.
+
+        Returns:
+        --------
+        tests : dict
+            Un diccionario con el siguiente formato:
+            {
+                'parametros': ['nombre_del_parametro_1', ..., 'nombre_del_parametro_n'],
+                'clases': [
+                    [{'clase_equivalencia': 'nombre_clase_1', 'representante': valor, 'valido': bool}, ...],
+                    ...
+                ],
+                'casos_validos': [[indice_clase_parametro_1, ..., indice_clase_parametro_n], ...],
+                'casos_invalidos': [[indice_clase_parametro_1, ..., indice_clase_parametro_n], ...]
+            }
+            Donde 'clases'[i][j] es la clase j del parámetro i y las filas de los casos usan esos índices.
+        """
+        max_classes = max([len(classes) for classes in self.__classes.values()], default=0)
+        typecode = 'H' if max_classes <= 0xFFFF else 'L'
+
+        valids, n_valids = array(typecode), 0
+        for items in valid_items:
+            valids.extend(item[0] for item in items)
+            n_valids += 1
+
+        invalids, n_invalids = array(typecode), 0
+        for position, classes in enumerate(self.__invalid_classes):
+            for item in classes:
+                invalids.extend(item[0] for item in self.__invalid_items(position, item))
+                n_invalids += 1
+
+        n = self.__n
+        return {
+            'parametros' : list(self.__attribute_names),
+            'clases' : [
+                [{'clase_equivalencia' : class_name, 'representante' : class_value['representante'], 'valido' : class_value['valido']}
+                 for _, class_name, class_value in self.__classes[attribute]]
+                for attribute in self.__attribute_names
+            ],
+            'casos_validos' : [valids[row * n:(row + 1) * n].tolist() for row in range(n_valids)],
+            'casos_invalidos' : [invalids[row * n:(row + 1) * n].tolist() for row in range(n_invalids)]
+        }
+
+
+def _build_valid_shard(parameters, start, stop):
+    """
+    Genera en un proceso hijo los casos válidos con índices en [start, stop). Las celdas iguales
+    del fragmento se comparten entre casos para que `pickle` las envíe una sola vez y el proceso
+    principal reconstruya el fragmento rápidamente.
+    """
+    cells = {}
+    return [
+        {attribute : cells.setdefault((attribute, cell['clase_equivalencia']), cell) for attribute, cell in case.items()}
+        for case in EquivalencePartition(parameters).iter_valid_cases(start, stop)
+    ]
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class LimitCache:
+
+    """
+    Un caché LRU acotado y seguro entre hilos para los valores límite ya calculados, de modo que las
+    restricciones que se repiten entre solicitudes cuestan una búsqueda en un diccionario.
+
+    Attributes:
+    -----------
+    DEFAULT_MAX_SIZE : int
+        El número máximo de entradas por defecto.
+    """
+
+    DEFAULT_MAX_SIZE : int = 1024
+
+    def __init__(self, max_size : int = DEFAULT_MAX_SIZE):
+        """
+        Args:
+        ------
+        max_size : int
+            El número máximo de entradas. Al superarlo se desaloja la entrada usada hace más tiempo.
+
+        Raises:
+        -------
+        ValueError : Si el tamaño máximo no es un entero positivo.
+        """
+        if type(max_size) != int or max_size < 1:
+            raise ValueError(f'El tamaño del caché debe ser un entero positivo ({max_size}).')
+
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key):
+        """
+        Retorna una copia de los valores límite guardados para `key`, o None si no están.
+        """
+        with self.__lock:
+            value = self.__entries.get(key)
+            if value is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return dict(value)
+
+    def put(self, key, value : dict):
+        """
+        Guarda una copia de los valores límite de `key`.
+        """
+        with self.__lock:
+            self.__entries[key] = dict(value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self):
+        """
+        Elimina todas las entradas y reinicia los contadores.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = self.__misses = self.__evictions = 0
+
+    def stats(self):
+        """
+        Retorna los contadores del caché.
+
+        Returns:
+        --------
+        stats : dict
+            Un diccionario con las claves 'aciertos', 'fallos', 'desalojos', 'entradas' y 'capacidad'.
+        """
+        with self.__lock:
+            return {
+                'aciertos' : self.__hits,
+                'fallos' : self.__misses,
+                'desalojos' : self.__evictions,
+                'entradas' : len(self.__entries),
+                'capacidad' : self.__max_size
+            }
@@ -0,0 +1,579 @@
+import ast
+import copy
+import math
+
+
+class Expression:
+
+    """
+    Una restricción de un parámetro del análisis de valores límite (por ejemplo '10<=x<=100 and x%2==0'),
+    analizada y compilada una sola vez.
+
+    La expresión se valida contra una lista blanca de nodos del AST (comparaciones, aritmética,
+    and/or/not, la variable `x` y la función `abs`) y se compila a una función de Python, por lo
+    que evaluarla es una sola llamada y no es posible ejecutar código arbitrario.
+
+    Attributes:
+    -----------
+    VARIABLE : str
+        El nombre de la variable de la expresión.
+    FUNCTIONS : dict
+        Las funciones que se pueden llamar desde la expresión.
+    MAX_EXPONENT : int
+        El mayor exponente permitido, acumulado entre potencias anidadas. Los exponentes deben ser
+        constantes para que evaluar la expresión no pueda producir enteros arbitrariamente grandes.
+    """
+
+    VARIABLE : str = 'x'
+    FUNCTIONS : dict = {'abs' : abs}
+    MAX_EXPONENT : int = 100
+
+    __NODES = (
+        ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+        ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+        ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+        ast.Constant, ast.Name, ast.Load, ast.Call
+    )
+
+    def __init__(self, source : str):
+        """
+        Analiza y compila la expresión. El operador '^' se interpreta como potencia.
+
+        Args:
+        ------
+        source : str
+            La expresión en formato de cadena.
+
+        Raises:
+        -------
+        SyntaxError : Si la expresión tiene una sintaxis inválida o usa construcciones no permitidas.
+        """
+        self.__source = source
+        self.__tree = ast.parse(source.replace('^', '**').strip(), mode='eval')
+        self.__validate(self.__tree)
+        self.__function = self.__compile(self.__tree)
+        self.__vectorized = None
+
+    def __call__(self, x):
+        return self.__function(x)
+
+    @property
+    def source(self):
+        return self.__source
+
+    @property
+    def tree(self):
+        return self.__tree
+
+    def intervals(self, bounds : tuple = None):
+        """
+        Traduce la expresión a una unión de intervalos de `x` cuando su forma lo permite, es decir,
+        cuando está formada por comparaciones de `x` con constantes ('a<x<=b', 'x>a and x<b', ...)
+        combinadas con and/or/not.
+
+        Args:
+        ------
+        bounds : tuple
+            Opcional. Un par (minimo, maximo) con el que se recortan los intervalos (cerrado en ambos extremos).
+
+        Returns:
+        --------
+        intervals : list | None
+            Una lista ordenada de intervalos disjuntos (minimo, minimo_cerrado, maximo, maximo_cerrado),
+            con `-inf`/`inf` para los extremos no acotados, o None si la expresión no se puede analizar.
+        """
+        intervals = self.__intervals(self.__tree.body)
+        if intervals is not None and bounds is not None:
+            intervals = _intersection(intervals, [(bounds[0], True, bounds[1], True)])
+        return intervals
+
+    def vectorized(self):
+        """
+        Retorna la expresión compilada para evaluarse sobre arreglos de NumPy: and/or/not se
+        reemplazan por '&', '|' y '== False' y las comparaciones encadenadas se separan, de modo que
+        el resultado es un arreglo de booleanos con un elemento por cada valor de `x`. Los booleanos
+        que se usan como números se convierten a enteros, como en Python.
+
+        Returns:
+        --------
+        Callable | None
+            None si la expresión usa el valor de un and/or que no es booleano como número, lo que
+            no se puede reproducir con operadores de bits.
+        """
+        if self.__vectorized is None:
+            vectorizer = _Vectorizer()
+            tree = vectorizer.visit(copy.deepcopy(self.__tree))
+            self.__vectorized = self.__compile(tree) if vectorizer.exact else False
+        return self.__vectorized or None
+
+    def holds(self, low, high):
+        """
+        Evalúa la expresión con aritmética de intervalos para todos los valores de `x` en [low, high].
+        Cada operación se ensancha un margen relativo que cubre los errores de redondeo de evaluar
+        la expresión en un punto, por lo que una respuesta True o False vale para cada punto del rango.
+
+        Args:
+        ------
+        low : Union[int, float]
+            El extremo inferior del rango.
+        high : Union[int, float]
+            El extremo superior del rango.
+
+        Returns:
+        --------
+        bool | None
+            True si la expresión se cumple en todo el rango, False si no se cumple en ningún punto y
+            None si no se puede decidir (cerca de un límite o con operaciones que no se acotan).
+        """
+        try:
+            return _truth(self.__tree.body, (_point(low)[0], _point(high)[1]))
+        except _Unbounded:
+            return None
+
+    def magnitude(self, low, high):
+        """
+        Acota, con aritmética de intervalos, el mayor valor absoluto que toma cualquier subexpresión
+        numérica de la expresión (incluidas las constantes) para los valores de `x` en [low, high].
+
+        Returns:
+        --------
+        float
+            La cota, o infinito si alguna subexpresión no se puede acotar.
+        """
+        result = 0.0
+        try:
+            x = (_point(low)[0], _point(high)[1])
+            for node in ast.walk(self.__tree.body):
+                if isinstance(node, (ast.Constant, ast.BinOp, ast.Call)) or self.__is_variable(node) or \
+                   (isinstance(node, ast.UnaryOp) and not isinstance(node.op, ast.Not)):
+                    node_low, node_high = _bounds(node, x)
+                    result = max(result, abs(node_low), abs(node_high))
+        except _Unbounded:
+            return math.inf
+        return result
+
+    def is_piecewise_monotone(self):
+        """
+        Indica si la expresión no usa operadores que produzcan patrones periódicos o puntos aislados
+        ('%', '//', '==', '!='), es decir, si se puede esperar que sus regiones válidas sean intervalos
+        anchos en los que tiene sentido bisecar.
+
+        Returns:
+        --------
+        bool
+        """
+        periodic = (ast.Mod, ast.FloorDiv, ast.Eq, ast.NotEq)
+        return not any(isinstance(node, periodic) for node in ast.walk(self.__tree))
+
+    def __intervals(self, node):
+        if isinstance(node, ast.BoolOp):
+            operands = [self.__intervals(value) for value in node.values]
+            if None in operands:
+                return None
+            result = operands[0]
+            for operand in operands[1:]:
+                result = _intersection(result, operand) if isinstance(node.op, ast.And) else _union(result, operand)
+            return result
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self.__intervals(node.operand)
+            return None if operand is None else _complement(operand)
+
+        if isinstance(node, ast.Compare):
+            result = _FULL
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                pair = self.__compare_intervals(left, op, right)
+                if pair is None:
+                    return None
+                result = _intersection(result, pair)
+                left = right
+            return result
+
+        if not self.__has_variable(node):
+            return _FULL if self.__constant(node) else []
+        return None
+
+    def __compare_intervals(self, left, op, right):
+        """
+        Retorna los intervalos de una comparación simple entre `x` y una constante.
+        """
+        if not self.__has_variable(left) and not self.__has_variable(right):
+            return _FULL if _OPERATORS[type(op)](self.__constant(left), self.__constant(right)) else []
+
+        if self.__is_variable(left) and not self.__has_variable(right):
+            value = self.__constant(right)
+        elif self.__is_variable(right) and not self.__has_variable(left):
+            value, op = self.__constant(left), _FLIPPED.get(type(op), op)()
+        else:
+            return None
+
+        if type(value) not in (int, float) or math.isnan(value):
+            return None
+
+        inf = math.inf
+        if isinstance(op, ast.Lt):
+            return [(-inf, False, value, False)]
+        if isinstance(op, ast.LtE):
+            return [(-inf, False, value, True)]
+        if isinstance(op, ast.Gt):
+            return [(value, False, inf, False)]
+        if isinstance(op, ast.GtE):
+            return [(value, True, inf, False)]
+        if isinstance(op, ast.Eq):
+            return [(value, True, value, True)]
+        return [(-inf, False, value, False), (value, False, inf, False)]
+
+    def __is_variable(self, node):
+        return isinstance(node, ast.Name) and node.id == Expression.VARIABLE
+
+    def __has_variable(self, node):
+        return any(self.__is_variable(child) for child in ast.walk(node))
+
+    def __constant(self, node):
+        code = compile(ast.fix_missing_locations(ast.Expression(body=node)), '<constant>', 'eval')
+        return eval(code, {'__builtins__' : {}, **Expression.FUNCTIONS})
+
+    def __validate(self, tree):
+        """
+        Verifica que la expresión solo contenga nodos permitidos.
+
+        Raises:
+        -------
+        SyntaxError : Si se encuentra un nodo no permitido.
+        """
+        for node in ast.walk(tree):
+            if not isinstance(node, self.__NODES):
+                raise SyntaxError(f'Construcción no permitida en `{self.__source}`: {type(node).__name__}')
+            if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+                raise SyntaxError(f'Constante no permitida en `{self.__source}`: {node.value!r}')
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in Expression.FUNCTIONS or len(node.args) != 1 or node.keywords:
+                    raise SyntaxError(f'Llamada no permitida en `{self.__source}`.')
+            elif isinstance(node, ast.Name) and node.id not in Expression.FUNCTIONS and node.id != Expression.VARIABLE:
+                raise SyntaxError(f'Nombre no permitido en `{self.__source}`: {node.id}')
+        if self.__power(tree) > Expression.MAX_EXPONENT:
+            raise SyntaxError(f'Potencia no permitida en `{self.__source}`: los exponentes deben ser constantes y '
+                              f'su producto entre potencias anidadas no puede superar {Expression.MAX_EXPONENT}.')
+
+    def __power(self, node):
+        """
+        Retorna el mayor producto de los valores absolutos de los exponentes de potencias anidadas
+        (al menos 1), o infinito si algún exponente no es una constante.
+        """
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            exponent = node.right
+            if isinstance(exponent, ast.UnaryOp) and isinstance(exponent.op, (ast.USub, ast.UAdd)):
+                exponent = exponent.operand
+            if not isinstance(exponent, ast.Constant):
+                return math.inf
+            return max(abs(exponent.value), 1) * self.__power(node.left)
+        return max((self.__power(child) for child in ast.iter_child_nodes(node)), default=1)
+
+    def __compile(self, tree):
+        """
+        Compila la expresión a una función `lambda x: <expresión>`.
+        """
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg=Expression.VARIABLE)], kwonlyargs=[], kw_defaults=[], defaults=[])
+        function = ast.Expression(body=ast.Lambda(args=arguments, body=tree.body))
+        ast.fix_missing_locations(function)
+        code = compile(function, '<lambda>', 'eval')
+        return eval(code, {'__builtins__' : {}, **Expression.FUNCTIONS})
+
+
+_FULL = [(-math.inf, False, math.inf, False)]
+
+_OPERATORS = {
+    ast.Lt : lambda a, b: a < b, ast.LtE : lambda a, b: a <= b,
+    ast.Gt : lambda a, b: a > b, ast.GtE : lambda a, b: a >= b,
+    ast.Eq : lambda a, b: a == b, ast.NotEq : lambda a, b: a != b
+}
+
+_FLIPPED = {ast.Lt : ast.Gt, ast.LtE : ast.GtE, ast.Gt : ast.Lt, ast.GtE : ast.LtE}
+
+
+def _union(first, second):
+    """
+    Une dos listas de intervalos y combina los que se solapan o se tocan.
+    """
+    result = []
+    for low, low_closed, high, high_closed in sorted(first + second, key=lambda interval: (interval[0], not interval[1])):
+        if result:
+            last_low, last_low_closed, last_high, last_high_closed = result[-1]
+            if low < last_high or (low == last_high and (low_closed or last_high_closed)):
+                if high > last_high or (high == last_high and high_closed):
+                    result[-1] = (last_low, last_low_closed, high, high_closed)
+                continue
+        result.append((low, low_closed, high, high_closed))
+    return result
+
+
+def _intersection(first, second):
+    """
+    Intersecta dos listas de intervalos.
+    """
+    result = []
+    for a_low, a_low_closed, a_high, a_high_closed in first:
+        for b_low, b_low_closed, b_high, b_high_closed in second:
+            if a_low > b_low or (a_low == b_low and not a_low_closed):
+                low, low_closed = a_low, a_low_closed
+            else:
+                low, low_closed = b_low, b_low_closed
+            if a_high < b_high or (a_high == b_high and not a_high_closed):
+                high, high_closed = a_high, a_high_closed
+            else:
+                high, high_closed = b_high, b_high_closed
+            if low < high or (low == high and low_closed and high_closed):
+                result.append((low, low_closed, high, high_closed))
+    return _union(result, [])
+
+
+def _complement(intervals):
+    """
+    Retorna el complemento de una lista ordenada de intervalos disjuntos.
+    """
+    result = []
+    low, low_closed = -math.inf, False
+    for interval_low, interval_low_closed, interval_high, interval_high_closed in intervals:
+        if low < interval_low or (low == interval_low and low_closed and not interval_low_closed):
+            result.append((low, low_closed, interval_low, not interval_low_closed))
+        low, low_closed = interval_high, not interval_high_closed
+    if low < math.inf:
+        result.append((low, low_closed, math.inf, False))
+    return result
+
+
+_SLACK = 1e-9
+
+
+class _Unbounded(Exception):
+
+    """
+    Se lanza cuando no se puede acotar una subexpresión con aritmética de intervalos.
+    """
+
+
+def _point(value):
+    """
+    Retorna el menor intervalo de flotantes que contiene a `value` (un entero grande puede no
+    ser representable como flotante).
+    """
+    try:
+        converted = float(value)
+    except OverflowError:
+        raise _Unbounded()
+    low = math.nextafter(converted, -math.inf) if converted > value else converted
+    high = math.nextafter(converted, math.inf) if converted < value else converted
+    return low, high
+
+
+def _bounds(node, x):
+    """
+    Retorna un intervalo (minimo, maximo) que contiene todos los valores de una subexpresión numérica
+    cuando `x` recorre el intervalo `x`.
+
+    Raises:
+    -------
+    _Unbounded : Si la subexpresión no se puede acotar (por ejemplo una división por un intervalo que
+    contiene al cero o una potencia con exponente variable).
+    """
+    if isinstance(node, ast.Constant):
+        return _point(node.value)
+    if isinstance(node, ast.Name) and node.id == Expression.VARIABLE:
+        return x
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        low, high = _bounds(node.operand, x)
+        return (-high, -low) if isinstance(node.op, ast.USub) else (low, high)
+    if isinstance(node, ast.Call):
+        low, high = _bounds(node.args[0], x)
+        if low >= 0:
+            return low, high
+        return (-high, -low) if high <= 0 else (0.0, max(-low, high))
+    if not isinstance(node, ast.BinOp):
+        raise _Unbounded()
+
+    (a_low, a_high), (b_low, b_high) = _bounds(node.left, x), _bounds(node.right, x)
+    try:
+        if isinstance(node.op, ast.Add):
+            values = [a_low + b_low, a_high + b_high]
+        elif isinstance(node.op, ast.Sub):
+            values = [a_low - b_high, a_high - b_low]
+        elif isinstance(node.op, ast.Mult):
+            values = [a * b for a in (a_low, a_high) for b in (b_low, b_high)]
+        elif isinstance(node.op, ast.Div) and (b_low > 0 or b_high < 0):
+            values = [a / b for a in (a_low, a_high) for b in (b_low, b_high)]
+        elif isinstance(node.op, ast.Pow) and b_low == b_high:
+            values = _power_bounds(a_low, a_high, b_low)
+        elif isinstance(node.op, ast.Mod) and (b_low > 0 or b_high < 0):
+            values = [0.0, b_high] if b_low > 0 else [b_low, 0.0]
+        elif isinstance(node.op, ast.FloorDiv) and (b_low > 0 or b_high < 0):
+            # El cociente redondeado puede caer del otro lado de un entero
+            quotients = [a / b for a in (a_low, a_high) for b in (b_low, b_high)]
+            values = [math.floor(min(quotients)) - 1.0, math.floor(max(quotients)) + 1.0]
+        else:
+            raise _Unbounded()
+    except (OverflowError, ZeroDivisionError):
+        raise _Unbounded()
+
+    scale = max(abs(value) for value in values + [a_low, a_high, b_low, b_high])
+    low, high = min(values), max(values)
+    if math.isnan(low) or math.isnan(high) or math.isnan(scale):
+        raise _Unbounded()
+    return low - scale * _SLACK, high + scale * _SLACK
+
+
+def _power_bounds(low, high, exponent):
+    """
+    Retorna los valores extremos de `base ** exponent` con la base en [low, high] y un exponente constante.
+    """
+    if exponent == int(exponent) and exponent >= 0:
+        values = [low ** int(exponent), high ** int(exponent)]
+        if int(exponent) % 2 == 0 and low < 0 < high:
+            values.append(0.0)
+        return values
+    if low > 0:
+        return [low ** exponent, high ** exponent]
+    raise _Unbounded()
+
+
+def _truth(node, x):
+    """
+    Retorna True si la subexpresión es verdadera para todo `x` en el intervalo `x`, False si es
+    falsa para todos y None si no se puede decidir.
+    """
+    if isinstance(node, ast.BoolOp):
+        values = [_truth(value, x) for value in node.values]
+        decided = isinstance(node.op, ast.Or)
+        if decided in values:
+            return decided
+        return None if None in values else not decided
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        value = _truth(node.operand, x)
+        return None if value is None else not value
+
+    if isinstance(node, ast.Compare):
+        values, left = [], node.left
+        for op, right in zip(node.ops, node.comparators):
+            try:
+                values.append(_compare_truth(op, _bounds(left, x), _bounds(right, x)))
+            except _Unbounded:
+                values.append(None)
+            left = right
+        if False in values:
+            return False
+        return None if None in values else True
+
+    try:
+        low, high = _bounds(node, x)
+    except _Unbounded:
+        return None
+    if low > 0 or high < 0:
+        return True
+    return False if low == high == 0 else None
+
+
+def _compare_truth(op, a, b):
+    """
+    Decide una comparación entre dos intervalos: True si se cumple para todos sus valores, False si
+    no se cumple para ninguno y None en otro caso.
+    """
+    (a_low, a_high), (b_low, b_high) = a, b
+    if isinstance(op, (ast.Gt, ast.GtE)):
+        op = _FLIPPED[type(op)]()
+        (a_low, a_high), (b_low, b_high) = b, a
+    if isinstance(op, ast.Lt):
+        return True if a_high < b_low else False if a_low >= b_high else None
+    if isinstance(op, ast.LtE):
+        return True if a_high <= b_low else False if a_low > b_high else None
+
+    disjoint = a_high < b_low or b_high < a_low
+    equal = a_low == a_high == b_low == b_high
+    if isinstance(op, ast.Eq):
+        return False if disjoint else True if equal else None
+    return True if disjoint else False if equal else None
+
+
+class _Vectorizer(ast.NodeTransformer):
+
+    """
+    Reescribe los operadores lógicos de una expresión como operadores de bits sobre booleanos.
+
+    Attributes:
+    -----------
+    exact : bool
+        False si la expresión usa como número el valor de un and/or que no es booleano.
+    """
+
+    def __init__(self):
+        self.exact = True
+
+    def visit_BoolOp(self, node):
+        operator = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [_boolean(self.visit(value)) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=operator, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return ast.Compare(left=_boolean(self.visit(node.operand)), ops=[ast.Eq()], comparators=[ast.Constant(value=False)])
+        node.operand = self.__number(node.operand)
+        return node
+
+    def visit_BinOp(self, node):
+        node.left, node.right = self.__number(node.left), self.__number(node.right)
+        return node
+
+    def visit_Call(self, node):
+        node.args = [self.__number(arg) for arg in node.args]
+        return node
+
+    def visit_Compare(self, node):
+        if any(isinstance(value, ast.BoolOp) and not _is_boolean(value) for value in [node.left] + node.comparators):
+            self.exact = False
+        node = self.generic_visit(node)
+        left, result = node.left, None
+        for op, right in zip(node.ops, node.comparators):
+            pair = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = pair if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=pair)
+            left = right
+        return result
+
+    def __number(self, node):
+        """
+        Vectoriza un operando numérico. Un arreglo de booleanos se multiplica por 1 para que '+' y
+        '-' operen con enteros (True + True == 2) y no como operadores lógicos de NumPy.
+        """
+        if isinstance(node, ast.BoolOp) and not _is_boolean(node):
+            self.exact = False
+        node = self.visit(node)
+        if _is_mask(node):
+            return ast.BinOp(left=node, op=ast.Mult(), right=ast.Constant(value=1))
+        return node
+
+
+def _is_boolean(node):
+    """
+    Indica si una subexpresión (sin vectorizar) siempre vale True o False.
+    """
+    if isinstance(node, ast.BoolOp):
+        return all(_is_boolean(value) for value in node.values)
+    return isinstance(node, ast.Compare) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not))
+
+
+def _is_mask(node):
+    """
+    Indica si una subexpresión vectorizada produce un arreglo de booleanos.
+    """
+    return isinstance(node, ast.Compare) or (isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)))
+
+
+def _boolean(node):
+    """
+    Convierte un operando numérico de and/or/not en un booleano (distinto de cero).
+    """
+    if _is_mask(node):
+        return node
+    return ast.Compare(left=node, ops=[ast.NotEq()], comparators=[ast.Constant(value=0)])
@@ -0,0 +1,102 @@
+from fractions import Fraction
+
+
+class Grid:
+
+    """
+    La malla de valores que recorre el análisis de valores límite desde un punto inicial: el primer
+    punto es el inicial y cada punto siguiente es el anterior más (o menos) delta redondeado al
+    número de decimales del delta, de modo que desde el segundo punto todos están sobre la red de
+    múltiplos de 10^-decimales y se pueden calcular de forma exacta a partir de su índice.
+
+    Attributes:
+    -----------
+    start : Union[int, float]
+        El primer punto de la malla.
+    second : Fraction
+        El valor exacto del segundo punto.
+    step : Fraction
+        El valor exacto del paso.
+    direction : int
+        1 si la malla sube y -1 si baja.
+    """
+
+    def __init__(self, start, delta, number_decimals : int, direction : int):
+        """
+        Args:
+        ------
+        start : Union[int, float]
+            El primer punto de la malla.
+        delta : Union[int, float]
+            El paso entre los puntos.
+        number_decimals : int
+            El número de decimales al que se redondea cada punto.
+        direction : int
+            1 si la malla sube y -1 si baja.
+        """
+        self.start = start
+        self.direction = direction
+        self.step = Fraction(str(delta))
+
+        self.__scale = 10 ** number_decimals
+        self.__second = round(start + direction * delta, number_decimals)
+        self.__second_scaled = round(Fraction(self.__second) * self.__scale)
+        self.__step_scaled = int(self.step * self.__scale)
+        self.second = Fraction(self.__second)
+
+    def __iter__(self):
+        """
+        Recorre los puntos de la malla sumando el paso sobre la red entera, sin redondear en cada paso.
+        """
+        yield self.start
+        yield self.__second
+        scaled, step = self.__second_scaled, self.direction * self.__step_scaled
+        if type(self.__second) == float:
+            scale = self.__scale
+            while True:
+                scaled += step
+                yield scaled / scale
+        else:
+            while True:
+                scaled += step
+                yield scaled
+
+    def point(self, k : int):
+        """
+        Retorna el punto k-ésimo de la malla, con el mismo valor y tipo que produce el recorrido.
+        """
+        if k == 0:
+            return self.start
+        if k == 1:
+            return self.__second
+        scaled = self.__second_scaled + self.direction * (k - 1) * self.__step_scaled
+        return scaled / self.__scale if type(self.__second) == float else scaled
+
+    def points(self, indexes):
+        """
+        Retorna los puntos de un arreglo de NumPy de índices enteros consecutivos.
+        """
+        values = self.__second_scaled + self.direction * (indexes - 1) * self.__step_scaled
+        if type(self.__second) == float:
+            values = values / self.__scale
+        if len(indexes) and indexes[0] == 0:
+            values[0] = self.start
+        return values
+
+    def last_index(self, in_range) -> int:
+        """
+        Retorna el índice del último punto que cumple la condición del ciclo del recorrido, o -1 si
+        ninguno la cumple, con búsqueda exponencial y bisección.
+        """
+        if not in_range(self.point(0)):
+            return -1
+        low, high = 0, 1
+        while in_range(self.point(high)):
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if in_range(self.point(middle)):
+                low = middle
+            else:
+                high = middle
+        return low
@@ -1,17 +1,27 @@
-import re
 import ast
-import signal
+import json
+import math
+import re
+import time
+from decimal import Decimal
+from fractions import Fraction
+from functools import partial
 
 from ..EquivalencePartition.equivalencePartition import EquivalencePartition
+from ..OrthogonalArray.orthogonalArray import OrthogonalArray
+from .cache import LimitCache
+from .expression import Expression
+from .grid import Grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Define a custom exception for the timeout
-class TimeoutException(BaseException):
+class TimeoutException(Exception):
     pass
 
-# Function to handle the timeout signal
-def handle_timeout(signum, frame):
-    raise Exception("La función tomo mucho tiempo en ejecutarse.")
-
 
 class LimitValueAnalysis:
     
@@ -23,12 +33,46 @@ class LimitValueAnalysis:
     MIN_OPT_SIZE : int
         El tamaño mínimo de la expresión matemática óptima. Por defecto, es 5.
     MAX_TIME : int
-        El tiempo máximo en segundos que se permite que la ejecución de una función tarde.
-        Por defecto, es 3 segundos.
+        El tiempo máximo en segundos que se permite que tarde la búsqueda de los valores límite
+        cuando quien llama no indica otro presupuesto.
+    DEADLINE_CHECK_STEPS : int
+        Cada cuántos pasos del recorrido se verifica si se agotó el tiempo.
+    BISECTION_LEAF_SIZE : int
+        El número de puntos de la malla por debajo del cual la bisección deja de dividir el rango y
+        evalúa los puntos uno a uno, en las restricciones que no se pueden traducir a intervalos
+        pero no tienen patrones periódicos.
+    NUMPY_CHUNK_SIZE : int
+        El número de puntos de la malla que se evalúan por bloque cuando NumPy está instalado.
+    NUMPY_MAX_MAGNITUDE : int
+        El mayor valor absoluto que puede tomar una subexpresión para evaluar una malla entera con
+        NumPy. Por encima, los enteros de 64 bits podrían desbordarse y se usa el recorrido en Python.
+    CACHE : LimitCache
+        El caché de valores límite compartido por todas las instancias del proceso, indexado por la
+        restricción normalizada y el delta. `CACHE.stats()` retorna sus contadores.
+    LIMITS : tuple
+        Los nombres de los valores límite que se calculan para cada parámetro.
+    NOMINAL : str
+        El valor límite que se usa como valor nominal de cada parámetro.
+    STRATEGIES : tuple
+        Las estrategias para combinar los valores límite en casos de prueba:
+        - 'estandar': un parámetro en un valor límite válido y los demás en su valor nominal (4n+1 casos).
+        - 'robusto': igual que 'estandar', y además un caso inválido por cada valor límite inválido (6n+1 casos).
+        - 'ortogonal': las clases válidas se combinan con un arreglo ortogonal (`OrthogonalArray`), que
+          cubre todos los pares de valores límite, y se agrega un caso inválido por cada valor inválido.
+        - 'producto': el producto completo de las clases, con `EquivalencePartition`.
     """
         
     MIN_OPT_SIZE : int = 5 # operacion min. 'a<x<b' | 'a>x>b'
     MAX_TIME : int = 4
+    DEADLINE_CHECK_STEPS : int = 4096
+    BISECTION_LEAF_SIZE : int = 16
+    NUMPY_CHUNK_SIZE : int = 1000000
+    NUMPY_MAX_MAGNITUDE : int = 2 ** 62
+    CACHE : LimitCache = LimitCache()
+    LIMITS : tuple = ('valor_minimo_invalido', 'primer_valor_minimo', 'segundo_valor_minimo', 'valor_medio',
+                      'primer_valor_maximo', 'segundo_valor_maximo', 'valor_maximo_invalido')
+    NOMINAL : str = 'valor_medio'
+    STRATEGIES : tuple = ('estandar', 'robusto', 'ortogonal', 'producto')
 
     def __init__(self, parameters : dict) -> None:
         """
@@ -81,8 +125,7 @@ class LimitValueAnalysis:
                 if len(lambda_str) < LimitValueAnalysis.MIN_OPT_SIZE:
                     raise ValueError(f'El lambda de {key} debe ser almenos de {LimitValueAnalysis.MIN_OPT_SIZE}.')
                 try:
-                    ast.parse(lambda_str)
-                    _ = lambda x : eval(lambda_str.replace('^', '**'))
+                    Expression(lambda_str)
                 except SyntaxError:
                     raise SyntaxError(f'El lambda de {key} tiene una sintaxis inválida')
 
@@ -94,12 +137,20 @@ class LimitValueAnalysis:
             return set(value.keys()) == set(['lambda', 'delta'])
         except Exception as e:
             raise ValueError(f'El objeto {value} debe tener la clave delta y lambda.')
-    def build_limits(self):
+    def build_limits(self, time_budget : float = MAX_TIME):
 
         """
         Construye una lista de objetos dict que representan los casos de prueba para cada
         parámetro en los valores proporcionados.
 
+        El tiempo se controla con un plazo sobre el reloj monotónico que se verifica dentro de las
+        búsquedas, sin señales, por lo que funciona desde hilos, procesos y ejecutores de asyncio.
+
+        Args:
+        ------
+        time_budget : float
+            El tiempo máximo en segundos para calcular los límites de todos los parámetros.
+
         Returns:
         --------
         List[Dict[str, Dict[str, Union[int, float]]]] : Una lista de objetos JSON, cada uno representando
@@ -114,29 +165,198 @@ class LimitValueAnalysis:
             - "first_max": El primer valor máximo válido para el parámetro.
             - "second_max": El segundo valor máximo válido para el parámetro.
             - "invalid_max": Un valor máximo inválido para el parámetro.
+
+        Raises:
+        -------
+        TimeoutException : Si los límites no se calculan dentro de `time_budget`.
         """
 
+        deadline = time.monotonic() + time_budget
         limits = {}
         for key, value in self.__parameters.items():
             if self.__has_lambda(value):
-                lambda_str = value['lambda']
-                delta = value['delta']
-                Fn = lambda x : eval(lambda_str.replace('^', '**'))
-                min_value, max_value = self.__get_min_max(lambda_str)
-                limit_values =  self.__get_values_aux(Fn, min_value, max_value, delta)
-                limits[key] = limit_values 
+                limits[key] = self.__get_cached_values(Expression(value['lambda']), value['lambda'], value['delta'], deadline)
 
         return limits
+
+    def __get_cached_values(self, Fn, lambda_str, delta, deadline):
+        """
+        Retorna los valores límite de una restricción desde `CACHE`, calculándolos si no están.
+        """
+        min_value, max_value = self.__get_min_max(lambda_str)
+
+        # La restricción se normaliza con su AST, que ignora espacios y paréntesis redundantes
+        cache_key = (ast.dump(Fn.tree), min_value, max_value, type(min_value), type(max_value), delta, type(delta))
+        limit_values = LimitValueAnalysis.CACHE.get(cache_key)
+        if limit_values is None:
+            limit_values = self.__get_values(Fn, min_value, max_value, delta, deadline)
+            LimitValueAnalysis.CACHE.put(cache_key, limit_values)
+        return limit_values
     
-    def build_test_cases(self):
-        limits = self.build_limits()
-        for key, value in limits.items():
-            self.__parameters[key] = {} 
-            for value_key, value_value in value.items():
-                self.__parameters[key][value_key] = {'valido' : not 'invalid' in value_key, 'representante' : value_value}
+    def build_test_cases(self, strategy : str = 'estandar', time_budget : float = MAX_TIME):
+        """
+        Construye los casos de prueba a partir de los valores límite de cada parámetro. Los parámetros
+        sin lambda se toman como clases de equivalencia, con el formato de `EquivalencePartition`.
+
+        Args:
+        ------
+        strategy : str
+            La estrategia de combinación (ver `STRATEGIES`). Por defecto, es 'estandar'.
+        time_budget : float
+            El tiempo máximo en segundos para calcular los límites (ver `build_limits`).
 
-        equivalence = EquivalencePartition(parameters=self.__parameters)
-        return equivalence.build_test_cases()
+        Returns:
+        --------
+        test_cases : dict
+            Un diccionario con las claves 'casos_validos' y 'casos_invalidos'. Cada caso tiene, por
+            parámetro, la clase ('clase_equivalencia') y su 'representante'. Con la estrategia
+            'ortogonal' también tiene la clave 'L' con el arreglo ortogonal usado.
+
+        Raises:
+        -------
+        ValueError : Si la estrategia no existe.
+        """
+        self.__valid_strategy(strategy)
+        classes = self.__build_classes(self.build_limits(time_budget))
+        if strategy == 'producto':
+            return EquivalencePartition(parameters=classes).build_test_cases()
+        if strategy == 'ortogonal':
+            return self.__build_orthogonal_cases(classes)
+        return self.__build_boundary_cases(classes, robust=strategy == 'robusto')
+
+    def __valid_strategy(self, strategy):
+        if strategy not in LimitValueAnalysis.STRATEGIES:
+            raise ValueError(f'La estrategia `{strategy}` no existe. Las estrategias son: {", ".join(LimitValueAnalysis.STRATEGIES)}.')
+
+    def __build_classes(self, limits):
+        """
+        Retorna las clases de equivalencia de todos los parámetros: las de los parámetros con lambda
+        se construyen con sus valores límite y las demás se copian sin cambios.
+        """
+        classes = {}
+        for key, value in self.__parameters.items():
+            if key in limits:
+                classes[key] = {limit : {'valido' : not 'invalid' in limit, 'representante' : limit_value} for limit, limit_value in limits[key].items()}
+            else:
+                classes[key] = value
+        return classes
+
+    def __build_boundary_cases(self, classes, robust):
+        """
+        Construye la suite de valores límite: un caso con todos los parámetros en su valor nominal y
+        un caso por cada otra clase válida de cada parámetro, con los demás en su valor nominal. Si
+        `robust` es verdadero se agrega, de la misma forma, un caso inválido por cada clase inválida.
+        Las clases sin representante (por ejemplo, un valor medio que no se encontró) se omiten.
+        """
+        nominal = {key : self.__nominal(value) for key, value in classes.items()}
+        base = {key : {'clase_equivalencia' : name, 'representante' : classes[key][name]['representante']} for key, name in nominal.items()}
+
+        valid_cases, invalid_cases = [dict(base)], []
+        for key, value in classes.items():
+            for name, equiv_class in value.items():
+                if name == nominal[key] or equiv_class['representante'] is None:
+                    continue
+                if not equiv_class['valido'] and not robust:
+                    continue
+                case = dict(base)
+                case[key] = {'clase_equivalencia' : name, 'representante' : equiv_class['representante']}
+                (valid_cases if equiv_class['valido'] else invalid_cases).append(case)
+
+        return {'casos_validos' : valid_cases, 'casos_invalidos' : invalid_cases}
+
+    def __build_orthogonal_cases(self, classes):
+        """
+        Construye los casos válidos con un arreglo ortogonal cuyos factores son los parámetros y cuyos
+        niveles son sus clases válidas, y un caso inválido por cada clase inválida con los demás
+        parámetros en su valor nominal.
+        """
+        levels = {
+            key : [name for name, equiv_class in value.items() if equiv_class['valido'] and equiv_class['representante'] is not None]
+            for key, value in classes.items()
+        }
+        orthogonal = OrthogonalArray(levels).build_test_cases()
+
+        valid_cases = []
+        for row in orthogonal['array']:
+            names = dict(zip(orthogonal['keys'], row))
+            valid_cases.append({
+                key : {'clase_equivalencia' : names[key], 'representante' : classes[key][names[key]]['representante']}
+                for key in classes
+            })
+
+        invalid_cases = self.__build_boundary_cases(classes, robust=True)['casos_invalidos']
+        return {'L' : orthogonal['L'], 'casos_validos' : valid_cases, 'casos_invalidos' : invalid_cases}
+
+    def __nominal(self, classes):
+        """
+        Retorna el nombre de la clase nominal de un parámetro: su valor medio (el del primer intervalo
+        si tiene varios) o, si no existe, su primera clase válida con representante.
+        """
+        for name in (LimitValueAnalysis.NOMINAL, f'{LimitValueAnalysis.NOMINAL}_1'):
+            if classes.get(name, {}).get('representante') is not None:
+                return name
+        for name, equiv_class in classes.items():
+            if equiv_class['valido'] and equiv_class['representante'] is not None:
+                return name
+        raise ValueError(f'No hay un valor nominal válido entre {list(classes)}.')
+
+    def estimate(self, strategy : str = 'estandar'):
+        """
+        Estima el resultado de `build_test_cases` sin recorrer la malla: el número exacto de casos
+        válidos e inválidos y el tamaño aproximado en bytes de la respuesta JSON. Los valores límite
+        de las restricciones con forma de intervalos se calculan, porque se obtienen de forma directa,
+        por lo que sus grupos por intervalo y sus valores faltantes coinciden con los de la construcción.
+        Los demás se aproximan con el literal más ancho del lambda desplazado un delta.
+
+        Args:
+        ------
+        strategy : str
+            La estrategia de combinación (ver `STRATEGIES`). Por defecto, es 'estandar'.
+
+        Returns:
+        --------
+        estimate : dict
+            Un diccionario con las claves 'casos_validos', 'casos_invalidos' y 'bytes'.
+
+        Raises:
+        -------
+        ValueError : Si la estrategia no existe.
+        """
+        self.__valid_strategy(strategy)
+        parameters = {}
+        for key, value in self.__parameters.items():
+            if not self.__has_lambda(value):
+                parameters[key] = value
+                continue
+
+            delta = value['delta']
+            Fn = Expression(value['lambda'])
+            if Fn.intervals() is not None:
+                limits = self.__get_cached_values(Fn, value['lambda'], delta, time.monotonic() + LimitValueAnalysis.MAX_TIME)
+                parameters[key] = self.__build_classes({key : limits})[key]
+                continue
+
+            number_decimals = self.__number_decimals(delta)
+            min_value, max_value = self.__get_min_max(value['lambda'])
+            if len(str(min_value)) > len(str(max_value)):
+                placeholder = round(min_value - delta, number_decimals)
+            else:
+                placeholder = round(max_value + delta, number_decimals)
+            parameters[key] = {limit : {'valido' : not 'invalid' in limit, 'representante' : placeholder} for limit in LimitValueAnalysis.LIMITS}
+
+        if strategy == 'producto':
+            return EquivalencePartition(parameters=parameters).estimate()
+        if strategy == 'ortogonal':
+            test_cases = self.__build_orthogonal_cases(parameters)
+            del test_cases['L']
+        else:
+            test_cases = self.__build_boundary_cases(parameters, robust=strategy == 'robusto')
+
+        return {
+            'casos_validos' : len(test_cases['casos_validos']),
+            'casos_invalidos' : len(test_cases['casos_invalidos']),
+            'bytes' : len(json.dumps(test_cases))
+        }
 
     
     
@@ -164,7 +384,7 @@ class LimitValueAnalysis:
         try:
             pattern = re.compile(r'-?\d+(?:\.\d+)?(?:\s*[+\-*/\*\*\^]\s*-?\d+(?:\.\d+)?)*|-?\d+(?:\.\d+)?')
             matches = re.findall(pattern, lambda_str)
-            values = [eval(match.replace('^', '**')) for match in matches]
+            values = [Expression(match)(None) for match in matches]
             min_value = min(values)
             max_value = max(values)
             if min_value == max_value:
@@ -174,7 +394,91 @@ class LimitValueAnalysis:
             raise  Exception(f'Error al intentar determinar el valor mínimo y máximo del lambda. ({lambda_str})')
         
 
-    def __get_values_aux(self, Fn, min_value, max_value, delta):
+    def __get_values(self, Fn, min_value, max_value, delta, deadline):
+        """
+        Obtiene los valores límite de un parámetro con la estrategia que corresponde a su restricción.
+
+        Si la restricción se traduce a varios intervalos disjuntos dentro del rango (por ejemplo
+        '(0<x<10) or (20<x<30)'), se calculan los valores límite de cada intervalo por separado
+        (ver `__get_interval_groups`) y las claves se numeran desde 1 ('primer_valor_minimo_1', ...).
+        """
+        intervals = Fn.intervals()
+        if intervals is not None:
+            bounded = Fn.intervals((min_value, max_value))
+            interval_values = self.__get_interval_groups(Fn, bounded, delta) if len(bounded) > 1 else []
+            if len(interval_values) > 1:
+                return {f'{key}_{number}' : value for number, values in enumerate(interval_values, start=1) for key, value in values.items()}
+
+            first_valid = partial(self.__first_valid, Fn, intervals)
+            return self.__get_values_grid(Fn, min_value, max_value, delta, first_valid)
+        if Fn.is_piecewise_monotone():
+            first_valid = partial(self.__first_valid_bisection, Fn, deadline)
+            return self.__get_values_grid(Fn, min_value, max_value, delta, first_valid)
+        if np is not None and self.__fits_numpy(Fn, min_value, max_value, delta):
+            first_valid = partial(self.__first_valid_numpy, Fn.vectorized(), deadline)
+            return self.__get_values_grid(Fn, min_value, max_value, delta, first_valid)
+        return self.__get_values_aux(Fn, min_value, max_value, delta, deadline)
+
+    def __fits_numpy(self, Fn, min_value, max_value, delta):
+        """
+        Indica si la restricción se puede evaluar con NumPy con los mismos resultados que en Python.
+        La expresión debe poder vectorizarse (ver `Expression.vectorized`). Las mallas de flotantes
+        usan los mismos flotantes de 64 bits; en las mallas enteras ningún valor intermedio puede
+        superar `NUMPY_MAX_MAGNITUDE` (ver `Expression.magnitude`).
+        """
+        if Fn.vectorized() is None:
+            return False
+        if not all(type(value) == int for value in (min_value, max_value, delta)):
+            return True
+        return Fn.magnitude(min_value - delta, max_value + delta) < LimitValueAnalysis.NUMPY_MAX_MAGNITUDE
+
+    def __get_interval_groups(self, Fn, intervals, delta):
+        """
+        Obtiene los valores límite de cada intervalo de la restricción, con la malla anclada en sus
+        extremos. Dos intervalos consecutivos se unen en un grupo si el valor inválido que los separa
+        cumple la restricción, es decir, si entre ellos no hay un punto inválido de la malla (por
+        ejemplo '(0<=x<=10) or (11<=x<=20)' con delta 1). Al final se omiten los grupos en los que cae
+        un solo punto de la malla, que no tienen segundo valor mínimo ni primer valor máximo, y los
+        intervalos en los que no cae ninguno.
+
+        Returns:
+        --------
+        List[Dict[str, Union[int, float]]] : Los valores límite de cada grupo, en orden.
+        """
+        groups = []
+        for interval in intervals:
+            try:
+                values = self.__get_interval_values(Fn, [interval], delta)
+            except AssertionError:
+                continue
+            if groups and (Fn(groups[-1][1]['valor_maximo_invalido']) or Fn(values['valor_minimo_invalido'])):
+                merged = groups[-1][0] + [interval]
+                groups[-1] = (merged, self.__get_interval_values(Fn, merged, delta))
+            else:
+                groups.append(([interval], values))
+        return [values for _, values in groups if values['segundo_valor_minimo'] is not None and values['primer_valor_maximo'] is not None]
+
+    def __get_interval_values(self, Fn, intervals, delta):
+        """
+        Obtiene los valores límite de un grupo de intervalos consecutivos de la restricción, con la
+        malla anclada en los extremos del grupo.
+
+        Raises:
+        -------
+        AssertionError : Se produce si ningún punto de la malla cae en el grupo.
+        """
+        low, low_closed, _, _ = intervals[0]
+        _, _, high, high_closed = intervals[-1]
+
+        def Fn_interval(x):
+            above = low < x or (low_closed and x == low)
+            below = x < high or (high_closed and x == high)
+            return above and below and Fn(x)
+
+        first_valid = partial(self.__first_valid, Fn_interval, intervals)
+        return self.__get_values_grid(Fn_interval, low, high, delta, first_valid)
+
+    def __get_values_aux(self, Fn, min_value, max_value, delta, deadline):
 
 
         """
@@ -190,6 +494,8 @@ class LimitValueAnalysis:
             El valor máximo para el parámetro de prueba.
         delta : Union[int, float]
             El paso entre los valores para el parámetro de prueba
+        deadline : float
+            El instante del reloj monotónico (`time.monotonic`) en el que se agota el tiempo.
 
         Returns:
         --------
@@ -208,56 +514,54 @@ class LimitValueAnalysis:
         AssertionError : Se produce si alguno de los argumentos de entrada es de tipo incorrecto.
 
         AssertionError : Se produce si no se pueden obtener los valores límite válidos para el parámetro.
-        """
-        signal.signal(signal.SIGALRM, handle_timeout)
-        signal.alarm(LimitValueAnalysis.MAX_TIME)
 
+        TimeoutException : Se produce si se alcanza el plazo antes de terminar el recorrido.
+        """
         assert type(min_value) == float or type(min_value) == int
         assert type(max_value) == float or type(max_value) == int
         assert type(delta) == float or type(delta) == int
 
-        number_decimals = 0
-        if type(delta) == float:
-            number_decimals = len(re.findall(r'\d', str(delta).split('.')[1]))
-
+        number_decimals = self.__number_decimals(delta)
 
         first_min, second_min = None, None
         first_max, second_max = None, None
         middle_value = None
         invalid_min, invalid_max = None, None
 
-        number = min_value
-        while number < max_value + delta:
+        # Los recorridos avanzan sobre la red entera de la malla (ver `Grid`), sin redondear en cada paso
+        steps = 0
+        limit = max_value + delta
+        for number in Grid(min_value, delta, number_decimals, 1):
+            if not number < limit: break
+            steps = self.__check_deadline(deadline, steps)
             if Fn(number):
                 if first_min is None: first_min = number
                 elif second_min is None:
                     second_min = number
                     break
-            number = round(number + delta, number_decimals)
 
-        number =  max_value
-        while number > min_value - delta:
+        limit = min_value - delta
+        for number in Grid(max_value, delta, number_decimals, -1):
+            if not number > limit: break
+            steps = self.__check_deadline(deadline, steps)
             if Fn(number):
                 if second_max is None: second_max = number
                 elif first_max is None:
                     first_max = number
                     break
-            number = round(number - delta, number_decimals)
 
         assert first_min != None and second_max != None, 'Error obteniendo los valores.'
 
-        number = (second_max+first_min)//2
-        while number > min_value:
+        for number in Grid((second_max+first_min)//2, delta, number_decimals, -1):
+            if not number > min_value: break
+            steps = self.__check_deadline(deadline, steps)
             if Fn(number):
                 middle_value = number
                 break
-            number = round(number - delta, number_decimals)
 
         invalid_min = round(first_min - delta, number_decimals)
         invalid_max = round(second_max + delta, number_decimals)
 
-        signal.alarm(0)
-
         return {
                 'valor_minimo_invalido': invalid_min,
                 'primer_valor_minimo': first_min, 
@@ -268,4 +572,191 @@ class LimitValueAnalysis:
                 'valor_maximo_invalido': invalid_max
             }
 
+    def __get_values_grid(self, Fn, min_value, max_value, delta, first_valid):
+        """
+        Obtiene los mismos valores límite que `__get_values_aux` sin recorrer el rango paso a paso.
+
+        Los valores se buscan sobre la misma malla que usa el recorrido (anclada en el mínimo al subir,
+        en el máximo al bajar y en el punto medio para el valor medio), pero el primer punto válido de
+        cada recorrido lo encuentra `first_valid`: de forma directa para las restricciones que se
+        traducen a intervalos ('a<x<b', 'x>=a and x<b', ...), por bisección con aritmética de intervalos
+        para las que no tienen patrones periódicos o evaluando la malla por bloques con NumPy para el resto.
+
+        Parameters:
+        -----------
+        Fn : Expression
+            La restricción del parámetro de prueba.
+        min_value : Union[int, float]
+            El valor mínimo para el parámetro de prueba.
+        max_value : Union[int, float]
+            El valor máximo para el parámetro de prueba.
+        delta : Union[int, float]
+            El paso entre los valores para el parámetro de prueba
+        first_valid : Callable
+            Recibe la malla, el índice inicial y la condición del ciclo, y retorna el índice del
+            primer punto válido o None.
+
+        Returns:
+        --------
+        Dict[str, Union[int, float]] : Un diccionario con los mismos valores límite que `__get_values_aux`.
+
+        Raises:
+        -------
+        AssertionError : Se produce si no se pueden obtener los valores límite válidos para el parámetro.
 
+        TimeoutException : Se produce si se alcanza el plazo antes de terminar el recorrido.
+        """
+        assert type(min_value) == float or type(min_value) == int
+        assert type(max_value) == float or type(max_value) == int
+        assert type(delta) == float or type(delta) == int
+
+        number_decimals = self.__number_decimals(delta)
+
+        first_min, second_min = None, None
+        first_max, second_max = None, None
+        middle_value = None
+
+        grid = Grid(min_value, delta, number_decimals, 1)
+        below_max = lambda number: number < max_value + delta
+        index = first_valid(grid, 0, below_max)
+        if index is not None:
+            first_min = grid.point(index)
+            index = first_valid(grid, index + 1, below_max)
+            if index is not None:
+                second_min = grid.point(index)
+
+        grid = Grid(max_value, delta, number_decimals, -1)
+        above_min = lambda number: number > min_value - delta
+        index = first_valid(grid, 0, above_min)
+        if index is not None:
+            second_max = grid.point(index)
+            index = first_valid(grid, index + 1, above_min)
+            if index is not None:
+                first_max = grid.point(index)
+
+        assert first_min != None and second_max != None, 'Error obteniendo los valores.'
+
+        grid = Grid((second_max+first_min)//2, delta, number_decimals, -1)
+        index = first_valid(grid, 0, lambda number: number > min_value)
+        if index is not None:
+            middle_value = grid.point(index)
+
+        return {
+                'valor_minimo_invalido': round(first_min - delta, number_decimals),
+                'primer_valor_minimo': first_min,
+                'segundo_valor_minimo': second_min,
+                'valor_medio': middle_value,
+                'primer_valor_maximo': first_max,
+                'segundo_valor_maximo': second_max,
+                'valor_maximo_invalido': round(second_max + delta, number_decimals)
+            }
+
+    def __first_valid(self, Fn, intervals, grid, start, in_range):
+        """
+        Retorna el índice del primer punto válido de la malla desde el índice `start`, o None si no
+        existe o si el recorrido hubiera terminado antes (`in_range` es la condición del ciclo).
+        El índice de entrada a cada intervalo se calcula de forma exacta y se confirma evaluando la
+        restricción en los puntos vecinos, lo que absorbe los errores de representación de los flotantes.
+        """
+        point = grid.point
+
+        if start == 0:
+            if Fn(point(0)):
+                return 0 if in_range(point(0)) else None
+            start = 1
+
+        ordered = intervals if grid.direction > 0 else reversed(intervals)
+        for low, _, high, _ in ordered:
+            entry = low if grid.direction > 0 else high
+            index = start
+            if not math.isinf(entry):
+                index = max(start, 1 + math.ceil(grid.direction * (Fraction(entry) - grid.second) / grid.step))
+
+            while index > start and Fn(point(index - 1)):
+                index -= 1
+            for index in range(index, index + 3):
+                if Fn(point(index)):
+                    return index if in_range(point(index)) else None
+        return None
+
+    def __first_valid_bisection(self, Fn, deadline, grid, start, in_range):
+        """
+        Retorna el índice del primer punto válido de la malla desde el índice `start` hasta el último
+        punto del recorrido, bisecando el rango de índices de izquierda a derecha. Los tramos en los
+        que la restricción no se cumple en ningún punto (ver `Expression.holds`) se descartan sin
+        evaluarlos y los tramos de menos de `BISECTION_LEAF_SIZE` puntos se recorren uno a uno.
+
+        El resultado siempre coincide con el recorrido completo: solo se descartan tramos demostrados
+        inválidos, y cerca de los límites, donde la aritmética de intervalos no decide, se evalúan los
+        puntos. Si no se puede acotar la restricción el costo es el del recorrido, con el mismo plazo.
+        """
+        point = grid.point
+        last = grid.last_index(in_range)
+
+        steps = 0
+        pending = [(start, last)] if start <= last else []
+        while pending:
+            low, high = pending.pop()
+            if high - low < LimitValueAnalysis.BISECTION_LEAF_SIZE:
+                for index in range(low, high + 1):
+                    steps = self.__check_deadline(deadline, steps)
+                    if Fn(point(index)):
+                        return index
+                continue
+
+            steps = self.__check_deadline(deadline, steps)
+            first, second = point(low), point(high)
+            holds = Fn.holds(min(first, second), max(first, second))
+            if holds is False:
+                continue
+            if holds and Fn(first):
+                return low
+            middle = (low + high) // 2
+            pending.append((middle + 1, high))
+            pending.append((low, middle))
+        return None
+
+    def __first_valid_numpy(self, vector, deadline, grid, start, in_range):
+        """
+        Retorna el índice del primer punto válido de la malla desde el índice `start` evaluando la
+        restricción vectorizada (ver `Expression.vectorized`) sobre bloques de `NUMPY_CHUNK_SIZE`
+        puntos, por lo que la memoria usada no depende del tamaño del rango. Las mallas enteras se
+        evalúan con enteros de 64 bits, solo cuando no pueden desbordarse (ver `__fits_numpy`).
+        """
+        last = grid.last_index(in_range)
+        for first in range(start, last + 1, LimitValueAnalysis.NUMPY_CHUNK_SIZE):
+            self.__check_deadline(deadline)
+            stop = min(first + LimitValueAnalysis.NUMPY_CHUNK_SIZE, last + 1)
+            values = grid.points(np.arange(first, stop, dtype=np.int64))
+            with np.errstate(all='ignore'):
+                valid = np.broadcast_to(vector(values), values.shape)
+            found = np.flatnonzero(valid)
+            if len(found):
+                return first + int(found[0])
+        return None
+
+    def __check_deadline(self, deadline, steps=0):
+        """
+        Cuenta un paso del recorrido y, cada `DEADLINE_CHECK_STEPS` pasos, verifica que no se haya
+        alcanzado el plazo.
+
+        Returns:
+        --------
+        int : El número de pasos contados.
+
+        Raises:
+        -------
+        TimeoutException : Si se alcanzó el plazo.
+        """
+        if steps % LimitValueAnalysis.DEADLINE_CHECK_STEPS == 0 and time.monotonic() > deadline:
+            raise TimeoutException('La función tomo mucho tiempo en ejecutarse.')
+        return steps + 1
+
+    def __number_decimals(self, delta):
+        """
+        Retorna el número de decimales del delta, que define la red de la malla de valores. También
+        admite deltas en notación científica ('1e-05').
+        """
+        if type(delta) != float:
+            return 0
+        return max(0, -Decimal(str(delta)).as_tuple().exponent)
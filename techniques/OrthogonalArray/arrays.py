@@ -1,249 +1,254 @@
+from array import array
 
 
-__L4 = {
-    'array' : [
-        [1, 1, 1],
-        [1, 2, 2],
-        [2, 1, 2],
-        [2, 2, 1]
-    ],
-    'levels' : 2,
-    'factors' : 3
-}
+class PackedArray:
 
-__L8 = {
-    'array' : [
-        [1, 1, 1, 1, 1, 1, 1],
-        [1, 1, 1, 2, 2, 2, 2],
-        [1, 2, 2, 1, 1, 2, 2],
-        [1, 2, 2, 2, 2, 1, 1],
-        [2, 1, 2, 1, 2, 1, 2],
-        [2, 1, 2, 2, 1, 2, 1],
-        [2, 2, 1, 1, 2, 2, 1],
-        [2, 2, 1, 2, 1, 1, 2]
-    ],
-    'levels' : 2,
-    'factors' : 7
-}
+    """
+    Un arreglo ortogonal del catálogo guardado de forma compacta: las celdas, fila por fila, en una
+    sola cadena con un dígito por celda (niveles desde 1). La tabla se decodifica a un `array('B')`
+    (un byte por celda) solo la primera vez que se usa, por lo que importar el catálogo no crea las
+    listas de enteros de todas las tablas.
 
-__L9 = {
-    'array' : [
-        [1, 1, 1, 1],
-        [2, 2, 2, 2],
-        [3, 3, 3, 3],
-        [1, 2, 3, 1],
-        [2, 3, 1, 2],
-        [3, 1, 2, 3],
-        [1, 3, 2, 3],
-        [2, 1, 3, 1],
-        [3, 2, 1, 2]
-    ],
-    'levels' : 3,
-    'factors' : 4
-}
+    Attributes:
+    -----------
+    levels : int
+        El mayor número de niveles de las columnas.
+    factors : int
+        El número de factores (columnas).
+    runs : int
+        El número de filas.
+    columns : tuple
+        El número de niveles de cada columna.
+    """
 
-__L12 = {
-    'array' : [
-        [1,1,1,1,1,1,1,1,1,1,1],
-        [1,1,1,1,1,2,2,2,2,2,2],
-        [1,1,2,2,2,1,1,1,2,2,2],
-        [1,2,1,2,2,1,2,2,1,1,2],
-        [1,2,2,1,2,2,1,2,1,2,1],
-        [1,2,2,2,1,2,2,1,2,1,1],
-        [2,1,2,2,1,1,2,2,1,2,1],
-        [2,1,2,1,2,2,2,1,1,1,2],
-        [2,1,1,2,2,2,1,2,2,1,1],
-        [2,2,2,1,1,1,1,2,2,1,2],
-        [2,2,1,2,1,2,1,1,1,2,2],
-        [2,2,1,1,2,1,2,1,2,2,1]
-    ],
-    'levels' : 2,
-    'factors' : 11
-}
+    __DIGITS = bytes.maketrans(b'123456789', bytes(range(1, 10)))
 
+    def __init__(self, levels : int, factors : int, columns : tuple, cells : str):
+        assert len(columns) == factors and len(cells) % factors == 0
 
-__L16 = {
-    'array' : [
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2],
-        [1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2],
-        [1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1],
-        [1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2],
-        [1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1],
-        [1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2],
-        [2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2],
-        [2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1],
-        [2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1],
-        [2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2],
-        [2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1],
-        [2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2],
-        [2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2],
-        [2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1]
-    ],
-    'levels' : 3,
-    'factors' : 15
-}
+        self.levels = levels
+        self.factors = factors
+        self.columns = columns
+        self.runs = len(cells) // factors
+        self.__cells = cells
+        self.__array = None
 
+    @property
+    def array(self):
+        """
+        Las filas de la tabla, cada una como una vista de solo lectura sobre el `array('B')` decodificado.
+        """
+        if self.__array is None:
+            cells = memoryview(array('B', self.__cells.encode('ascii').translate(PackedArray.__DIGITS))).toreadonly()
+            self.__array = [cells[row * self.factors : (row + 1) * self.factors] for row in range(self.runs)]
+        return self.__array
 
-__L16B = {
-    'array' : [
-        [1, 1, 1, 1, 1],
-        [1, 2, 2, 2, 2],
-        [1, 3, 3, 3, 3],
-        [1, 4, 4, 4, 4],
-        [2, 1, 2, 3, 4],
-        [2, 2, 1, 4, 3],
-        [2, 3, 4, 1, 2],
-        [2, 4, 3, 2, 1],
-        [3, 1, 3, 4, 2],
-        [3, 2, 4, 3, 1],
-        [3, 3, 1, 2, 4],
-        [3, 4, 2, 1, 3],
-        [4, 1, 4, 2, 3],
-        [4, 2, 3, 1, 4],
-        [4, 3, 2, 4, 1],
-        [4, 4, 1, 3, 2]
-    ],
-    'levels' : 4,
-    'factors' : 5
-}
 
+__L4 = PackedArray(levels=2, factors=3, columns=(2,) * 3, cells=(
+    '111'
+    '122'
+    '212'
+    '221'
+))
 
-__L18 = {
-    'array' : [
-        [1,1,1,1,1,1,1,1],
-        [1,1,2,2,2,2,2,2],
-        [1,1,3,3,3,3,3,3],
-        [1,2,1,1,2,2,3,3],
-        [1,2,2,2,3,3,1,1],
-        [1,2,3,3,1,1,2,2],
-        [1,3,1,2,1,3,2,3],
-        [1,3,2,3,2,1,3,1],
-        [1,3,3,1,3,2,1,2],
-        [2,1,1,3,3,2,2,1],
-        [2,1,2,1,1,3,3,2],
-        [2,1,3,2,2,1,1,3],
-        [2,2,1,2,3,1,3,2],
-        [2,2,2,3,1,2,1,3],
-        [2,2,2,3,1,2,1,3],
-        [2,2,3,1,2,3,2,1],
-        [2,3,1,3,2,3,1,2],
-        [2,3,2,1,3,1,2,3],
-        [2,3,3,2,1,2,3,1]
-    ],
-    'levels' : 3,
-    'factors' : 8
-}
 
-__L25 =  {
-    'array' : [
-        [1, 1, 1, 1, 1, 1],
-        [1, 2, 2, 2, 2, 2],
-        [1, 3, 3, 3, 3, 3],
-        [1, 4, 4, 4, 4, 4],
-        [1, 5, 5, 5, 5, 5],
-        [2, 1, 2, 3, 4, 5],
-        [2, 2, 3, 4, 5, 1],
-        [2, 3, 4, 5, 1, 2],
-        [2, 4, 5, 1, 2, 3],
-        [2, 5, 1, 2, 3, 4],
-        [3, 1, 3, 5, 2, 4],
-        [3, 2, 4, 1, 3, 5],
-        [3, 3, 5, 2, 4, 1],
-        [3, 4, 1, 3, 5, 2],
-        [3, 5, 2, 4, 1, 3],
-        [4, 1, 4, 2, 5, 3],
-        [4, 2, 5, 3, 1, 4],
-        [4, 3, 1, 4, 2, 5],
-        [4, 4, 2, 5, 3, 1],
-        [4, 5, 3, 1, 4, 2],
-        [5, 1, 5, 4, 3, 2],
-        [5, 2, 1, 5, 4, 3],
-        [5, 3, 2, 1, 5, 4],
-        [5, 4, 3, 2, 1, 5],
-        [5, 5, 4, 3, 2, 1]
-    ],
-    'levels' : 5,
-    'factors' : 6
-}
+__L8 = PackedArray(levels=2, factors=7, columns=(2,) * 7, cells=(
+    '1111111'
+    '1112222'
+    '1221122'
+    '1222211'
+    '2121212'
+    '2122121'
+    '2211221'
+    '2212112'
+))
 
 
-__L27 = {
-    'array' : [
-        [1,1,1,1,1,1,1,1,1,1,1,1,1],
-        [1,1,1,1,2,2,2,2,2,2,2,2,2],
-        [1,1,1,1,3,3,3,3,3,3,3,3,3],
-        [1,2,2,2,1,1,1,2,2,2,3,3,3],
-        [1,2,2,2,2,2,2,3,3,3,1,1,1],
-        [1,2,2,2,3,3,3,1,1,1,2,2,2],
-        [1,3,3,3,1,1,1,3,3,3,2,2,2],
-        [1,3,3,3,2,2,2,1,1,1,3,3,3],
-        [1,3,3,3,3,3,3,2,2,2,1,1,1],
-        [2,1,2,3,1,2,3,1,2,3,1,2,3],
-        [2,1,2,3,2,3,1,2,3,1,2,3,1],
-        [2,1,2,3,3,1,2,3,1,2,3,1,2],
-        [2,2,3,1,1,2,3,2,3,1,3,1,2],
-        [2,2,3,1,2,3,1,3,1,2,1,2,3],
-        [2,2,3,1,3,1,2,1,2,3,2,3,1],
-        [2,3,1,2,1,2,3,3,1,2,2,3,1],
-        [2,3,1,2,2,3,1,1,2,3,3,1,2],
-        [2,3,1,2,3,1,2,2,3,1,1,2,3],
-        [3,1,3,2,1,3,2,1,3,2,1,3,2],
-        [3,1,3,2,2,1,3,2,1,3,2,1,3],
-        [3,1,3,2,3,2,1,3,2,1,3,2,1],
-        [3,2,1,3,1,3,2,2,1,3,3,2,1],
-        [3,2,1,3,2,1,3,3,2,1,1,3,2],
-        [3,2,1,3,3,2,1,1,3,2,2,1,3],
-        [3,3,2,1,1,3,2,3,2,1,2,1,3],
-        [3,3,2,1,2,1,3,1,3,2,3,2,1],
-        [3,3,2,1,3,2,1,2,1,3,1,3,2]
-    ],
-    'levels' : 3,
-    'factors' : 13
-}
+__L9 = PackedArray(levels=3, factors=4, columns=(3,) * 4, cells=(
+    '1111'
+    '2221'
+    '3331'
+    '1232'
+    '2312'
+    '3122'
+    '1323'
+    '2133'
+    '3213'
+))
 
 
+__L12 = PackedArray(levels=2, factors=11, columns=(2,) * 11, cells=(
+    '11111111111'
+    '11111222222'
+    '11222111222'
+    '12122122112'
+    '12212212121'
+    '12221221211'
+    '21221122121'
+    '21212221112'
+    '21122212211'
+    '22211112212'
+    '22121211122'
+    '22112121221'
+))
 
 
-__L32 =  {
-    'array' : [
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2],
-        [1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2],
-        [1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2],
-        [1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1],
-        [1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1],
-        [1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2],
-        [1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2],
-        [1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1],
-        [1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1],
-        [1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 1, 1, 2, 2],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2],
-        [1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2],
-        [1, 2, 2, 2, 2, 1, 1, 2, 2, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1, 2, 2, 1, 1, 2, 2, 2, 2, 1, 1],
-        [2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2],
-        [2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1],
-        [2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1],
-        [2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 1, 2, 1, 2],
-        [2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1],
-        [2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2],
-        [2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2],
-        [2, 1, 2, 2, 1, 2, 1, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 1, 2, 1, 2, 2, 1, 2, 1],
-        [2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1],
-        [2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2],
-        [2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2],
-        [2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1, 1, 2, 2, 1],
-        [2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2],
-        [2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1],
-        [2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1],
-        [2, 2, 1, 2, 1, 1, 2, 2, 1, 1, 2, 1, 2, 2, 1, 2, 1, 1, 2, 1, 2, 2, 1, 1, 2, 2, 1, 2, 1, 1, 2]
-    ],
-    'levels' : 2,
-    'factors' : 32
-}
+__L16 = PackedArray(levels=2, factors=15, columns=(2,) * 15, cells=(
+    '111111111111111'
+    '111111122222222'
+    '111222211112222'
+    '111222222221111'
+    '122112211221122'
+    '122112222112211'
+    '122221111222211'
+    '122221122111122'
+    '212121212121212'
+    '212121221212121'
+    '212212112122121'
+    '212212121211212'
+    '221122112211221'
+    '221122121122112'
+    '221211212212112'
+    '221211221121221'
+))
+
+
+__L16B = PackedArray(levels=4, factors=5, columns=(4,) * 5, cells=(
+    '11111'
+    '12222'
+    '13333'
+    '14444'
+    '21234'
+    '22143'
+    '23412'
+    '24321'
+    '31342'
+    '32431'
+    '33124'
+    '34213'
+    '41423'
+    '42314'
+    '43241'
+    '44132'
+))
+
+
+__L18 = PackedArray(levels=3, factors=8, columns=(2, 3, 3, 3, 3, 3, 3, 3), cells=(
+    '11111111'
+    '11222222'
+    '11333333'
+    '12112233'
+    '12223311'
+    '12331122'
+    '13121323'
+    '13232131'
+    '13313212'
+    '21133221'
+    '21211332'
+    '21322113'
+    '22123132'
+    '22231213'
+    '22312321'
+    '23132312'
+    '23213123'
+    '23321231'
+))
+
+
+__L25 = PackedArray(levels=5, factors=6, columns=(5,) * 6, cells=(
+    '111111'
+    '122222'
+    '133333'
+    '144444'
+    '155555'
+    '212345'
+    '223451'
+    '234512'
+    '245123'
+    '251234'
+    '313524'
+    '324135'
+    '335241'
+    '341352'
+    '352413'
+    '414253'
+    '425314'
+    '431425'
+    '442531'
+    '453142'
+    '515432'
+    '521543'
+    '532154'
+    '543215'
+    '554321'
+))
+
+
+__L27 = PackedArray(levels=3, factors=13, columns=(3,) * 13, cells=(
+    '1111111111111'
+    '1111222222222'
+    '1111333333333'
+    '1222111222333'
+    '1222222333111'
+    '1222333111222'
+    '1333111333222'
+    '1333222111333'
+    '1333333222111'
+    '2123123123123'
+    '2123231231231'
+    '2123312312312'
+    '2231123231312'
+    '2231231312123'
+    '2231312123231'
+    '2312123312231'
+    '2312231123312'
+    '2312312231123'
+    '3132132132132'
+    '3132213213213'
+    '3132321321321'
+    '3213132213321'
+    '3213213321132'
+    '3213321132213'
+    '3321132321213'
+    '3321213132321'
+    '3321321213132'
+))
+
+
+__L32 = PackedArray(levels=2, factors=31, columns=(2,) * 31, cells=(
+    '1111111111111111111111111111111'
+    '1111111111111112222222222222222'
+    '1111111222222221111111122222222'
+    '1111111222222222222222211111111'
+    '1112222111122221111222211112222'
+    '1112222111122222222111122221111'
+    '1112222222211111111222222221111'
+    '1112222222211112222111111112222'
+    '1221122112211221122112211221122'
+    '1221122112211222211221122112211'
+    '1221122221122111122112222112211'
+    '1221122221122112211221111221122'
+    '1222211112222111122221111222211'
+    '1222211112222112211112222111122'
+    '1222211221111221122221122111122'
+    '1222211221111222211112211222211'
+    '2121212121212121212121212121212'
+    '2121212121212122121212121212121'
+    '2121212212121211212121221212121'
+    '2121212212121212121212112121212'
+    '2122121121221211212212112122121'
+    '2122121121221212121121221211212'
+    '2122121212112121212212121211212'
+    '2122121212112122121121212122121'
+    '2211221122112211221122112211221'
+    '2211221122112212112211221122112'
+    '2211221211221121221122121122112'
+    '2211221211221122112211212211221'
+    '2212112122121121221211212212112'
+    '2212112122121122112122121121221'
+    '2212112211212211221211221121221'
+    '2212112211212212112122112212112'
+))
 
 
 orthogonal_arrays = {
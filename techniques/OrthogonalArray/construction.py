@@ -0,0 +1,178 @@
+from itertools import product
+
+
+class GaloisField:
+
+    """
+    Un campo finito GF(q) con q = p^k (p primo), representado con polinomios de grado menor que k
+    sobre GF(p) codificados como enteros en base p. Las operaciones se precalculan en tablas.
+
+    Attributes:
+    -----------
+    order : int
+        El número de elementos del campo (q).
+    add : list
+        La tabla de la suma, add[a][b] = a + b.
+    mul : list
+        La tabla de la multiplicación, mul[a][b] = a * b.
+    """
+
+    def __init__(self, order : int):
+        """
+        Args:
+        ------
+        order : int
+            El número de elementos del campo. Debe ser potencia de un primo.
+
+        Raises:
+        -------
+        ValueError : Si `order` no es potencia de un primo.
+        """
+        power = prime_power(order)
+        if power is None:
+            raise ValueError(f'{order} no es potencia de un primo.')
+
+        self.order = order
+        self.__p, self.__k = power
+        if self.__k == 1:
+            # Con q primo las operaciones son módulo q
+            self.add = [[(a + b) % order for b in range(order)] for a in range(order)]
+            self.mul = [[(a * b) % order for b in range(order)] for a in range(order)]
+            return
+
+        self.__modulus = self.__irreducible()
+        self.add = [[self.__add(a, b) for b in range(order)] for a in range(order)]
+        self.mul = [[self.__mul(a, b) for b in range(order)] for a in range(order)]
+
+    def __digits(self, value, size):
+        return [(value // self.__p ** i) % self.__p for i in range(size)]
+
+    def __number(self, digits):
+        return sum(digit * self.__p ** i for i, digit in enumerate(digits))
+
+    def __add(self, a, b):
+        p, k = self.__p, self.__k
+        return self.__number([(x + y) % p for x, y in zip(self.__digits(a, k), self.__digits(b, k))])
+
+    def __mul(self, a, b):
+        p, k = self.__p, self.__k
+
+        # Producto de polinomios y reducción módulo el polinomio irreducible (mónico de grado k)
+        x, y = self.__digits(a, k), self.__digits(b, k)
+        result = [0] * (2 * k - 1)
+        for i, xi in enumerate(x):
+            for j, yj in enumerate(y):
+                result[i + j] = (result[i + j] + xi * yj) % p
+        for degree in range(2 * k - 2, k - 1, -1):
+            factor = result[degree]
+            if factor:
+                for i, coefficient in enumerate(self.__modulus):
+                    result[degree - k + i] = (result[degree - k + i] - factor * coefficient) % p
+        return self.__number(result[:k])
+
+    def __irreducible(self):
+        """
+        Busca un polinomio mónico irreducible de grado k sobre GF(p), retornando sus coeficientes
+        de grado 0 a k. Un polinomio de grado k es irreducible si no tiene factores mónicos de grado
+        1 a k // 2.
+        """
+        p, k = self.__p, self.__k
+        for tail in product(range(p), repeat=k):
+            candidate = list(reversed(tail)) + [1]
+            if candidate[0] == 0:
+                continue
+            if not any(self.__divides(list(divisor) + [1], candidate)
+                       for degree in range(1, k // 2 + 1) for divisor in product(range(p), repeat=degree)):
+                return candidate
+        raise ValueError(f'No hay polinomio irreducible de grado {k} sobre GF({p}).')
+
+    def __divides(self, divisor, polynomial):
+        p = self.__p
+        remainder = list(polynomial)
+        for degree in range(len(remainder) - 1, len(divisor) - 2, -1):
+            factor = remainder[degree]
+            if factor:
+                shift = degree - len(divisor) + 1
+                for i, coefficient in enumerate(divisor):
+                    remainder[shift + i] = (remainder[shift + i] - factor * coefficient) % p
+        return not any(remainder)
+
+
+def prime_power(n : int):
+    """
+    Retorna (p, k) si n = p^k con p primo, o None en otro caso.
+    """
+    if n < 2:
+        return None
+    p = next(d for d in range(2, n + 1) if n % d == 0)
+    k = 0
+    while n % p == 0:
+        n //= p
+        k += 1
+    return (p, k) if n == 1 else None
+
+
+def orthogonal_array_runs(levels : int, factors : int) -> int:
+    """
+    Retorna el número de filas del arreglo que construye `build_orthogonal_array`, sin construirlo.
+    """
+    q, m = _dimensions(levels, factors)
+    return q ** m
+
+
+def _dimensions(levels, factors):
+    """
+    Retorna (q, m): la menor potencia de un primo q mayor o igual a `levels` (y a 2) y la menor
+    dimensión m con al menos `factors` columnas.
+    """
+    q = max(levels, 2)
+    while prime_power(q) is None:
+        q += 1
+    m = 1
+    while (q ** m - 1) // (q - 1) < factors:
+        m += 1
+    return q, m
+
+
+def build_orthogonal_array(levels : int, factors : int, max_runs : int):
+    """
+    Construye un arreglo ortogonal de fuerza 2 con la construcción de Rao-Hamming: con q la menor
+    potencia de un primo mayor o igual a `levels`, las filas son todos los vectores u de GF(q)^m y
+    las columnas los vectores v de GF(q)^m cuya primera coordenada no nula es 1, con celda u·v.
+    Se obtiene OA(q^m, (q^m - 1) / (q - 1), q, 2) con el menor m que alcanza `factors` columnas.
+
+    Si `levels` no es potencia de un primo, los q niveles se colapsan a `levels` (el nivel v se
+    reemplaza por v mod `levels`), lo que conserva todos los pares de valores aunque no el balance exacto.
+
+    Args:
+    ------
+    levels : int
+        El número de niveles de los factores.
+    factors : int
+        El número de factores (columnas).
+    max_runs : int
+        El número máximo de filas que se permite construir.
+
+    Returns:
+    --------
+    array : list | None
+        Las filas del arreglo con niveles de 1 a `levels`, o None si se necesitan más de `max_runs` filas.
+    """
+    q, m = _dimensions(levels, factors)
+    if q ** m > max_runs:
+        return None
+
+    field = GaloisField(q)
+    add, mul = field.add, field.mul
+    columns = [vector for vector in product(range(q), repeat=m) if next((c for c in vector if c), 0) == 1][:factors]
+
+    array = []
+    for u in product(range(q), repeat=m):
+        row = []
+        for v in columns:
+            cell = 0
+            for a, b in zip(u, v):
+                cell = add[cell][mul[a][b]]
+            row.append(cell % levels + 1)
+        array.append(row)
+    return array
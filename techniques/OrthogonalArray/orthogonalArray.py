@@ -1,9 +1,75 @@
 
 
+import json
+from itertools import combinations, product
+from math import prod
+
+from ..CoveringArray.coveringArray import CoveringArray
 from .arrays import orthogonal_arrays
+from .construction import build_orthogonal_array, orthogonal_array_runs
+
+
+def _index_arrays(arrays : dict):
+    """
+    Indexa el catálogo de arreglos ortogonales por el mayor número de niveles de sus columnas, usando
+    solo sus metadatos, por lo que ninguna tabla se decodifica al construir el índice.
+
+    Returns:
+    --------
+    index : dict
+        Un diccionario nivel -> lista de (filas, nombre, niveles_por_columna), ordenada por número de filas.
+    """
+    index = {}
+    for name, value in arrays.items():
+        index.setdefault(value.levels, []).append((value.runs, name, list(value.columns)))
+    for entries in index.values():
+        entries.sort(key=lambda entry: entry[0])
+    return index
+
+
+def _merge_columns(array : list, count : int):
+    """
+    Fusiona columnas de un arreglo de 2 niveles en `count` columnas de 4 niveles. Dos columnas a y b
+    se fusionan en la columna 2*(a-1) + b cuando el arreglo tiene también su columna de interacción
+    (a xor b), que se descarta; así la columna fusionada es ortogonal a las demás.
+
+    Returns:
+    --------
+    array : list | None
+        Las filas con las `count` columnas fusionadas primero y luego las columnas de 2 niveles sin
+        usar, o None si no hay suficientes ternas de columnas disjuntas.
+    """
+    columns = [[cell - 1 for cell in column] for column in zip(*array)]
+    used, merged = set(), []
+    for a, b in combinations(range(len(columns)), 2):
+        if len(merged) == count:
+            break
+        if a in used or b in used:
+            continue
+        interaction = [x ^ y for x, y in zip(columns[a], columns[b])]
+        complement = [1 - cell for cell in interaction]
+        c = next((c for c in range(len(columns)) if c not in used and c not in (a, b) and columns[c] in (interaction, complement)), None)
+        if c is not None:
+            used.update((a, b, c))
+            merged.append((a, b))
+    if len(merged) < count:
+        return None
+
+    rest = [column for column in range(len(columns)) if column not in used]
+    return [
+        [2 * row[a] + row[b] - 2 for a, b in merged] + [row[column] for column in rest]
+        for row in array
+    ]
 
 
 class OrthogonalArray:
+
+    MAX_RUNS : int = 1024 # filas máximas de un arreglo construido cuando no hay uno en el catálogo
+    COVERING_MAX_TIME : float = 4 # segundos máximos para construir el arreglo de cubrimiento de respaldo
+    COVERING_IMPROVEMENT_TIME : float = 0.5 # segundos para reducir el arreglo de cubrimiento de respaldo
+    COVERING_TYPE : str = 'arreglo_cubrimiento'
+    INDEX : dict = _index_arrays(orthogonal_arrays)
+
     def __init__(self, parameters : dict):
         
         self.__parameters = parameters
@@ -36,11 +102,109 @@ class OrthogonalArray:
 
 
     def __get_orthogonal_array(self):
-        for key, value in self.__orthogonal_arrays.items():
-            if value['levels'] == self.__max_level and self.__num_factors <= value['factors']:
-                return key, value['array']
-                
+        """
+        Selecciona el arreglo ortogonal con menos filas que puede alojar los parámetros: cada
+        parámetro necesita una columna distinta con al menos tantos niveles como valores tiene.
+        Se consideran los arreglos del catálogo (ver `INDEX`), incluidos los mixtos como L18 y los de
+        2 niveles con columnas fusionadas a 4 niveles (ver `_merge_columns`), y el que se puede
+        construir (ver `construction.build_orthogonal_array`); en caso de empate se prefiere el del catálogo.
+        Si el producto cartesiano de los valores no tiene más filas que el mejor de ellos (por ejemplo
+        con uno o dos parámetros), se usa el producto.
+
+        Returns:
+        --------
+        Tuple[str, list, list] : El nombre del arreglo, sus filas y, para cada parámetro en orden
+        descendente de número de valores, el índice de la columna que le corresponde.
+
+        Raises:
+        -------
+        ValueError : Si ningún arreglo del catálogo sirve y el construido necesitaría más de `MAX_RUNS` filas.
+        """
+        profile = sorted((len(value) for value in self.__parameters.values()), reverse=True)
+
+        # Los parámetros de 3 o 4 valores también caben en arreglos de 2 niveles fusionando columnas
+        merges = sum(1 for level in profile if 2 < level <= 4) if self.__max_level <= 4 else 0
+
+        # Primero los arreglos con suficientes niveles, para que en un empate no se fusionen columnas
+        best = None
+        for level in sorted(OrthogonalArray.INDEX, key=lambda level: level < self.__max_level):
+            if level < self.__max_level and not (level == 2 and merges):
+                continue
+            for runs, name, columns in OrthogonalArray.INDEX[level]:
+                if best is not None and runs >= best[0]:
+                    break
+                array = self.__orthogonal_arrays[name].array
+                layouts = [(array, columns)]
+                if level == 2 and merges:
+                    merged = _merge_columns(array, merges)
+                    if merged is not None:
+                        layouts.append((merged, [4] * merges + [2] * (len(merged[0]) - merges)))
+                found = False
+                for layout, layout_columns in layouts:
+                    assignment = self.__assign_columns(profile, layout_columns)
+                    if assignment is not None:
+                        best, found = (runs, name, layout, assignment), True
+                        break
+                if found:
+                    break
+
+        runs = orthogonal_array_runs(self.__max_level, self.__num_factors)
+        built = runs <= OrthogonalArray.MAX_RUNS and (best is None or runs < best[0])
+        best_runs = runs if built else best[0] if best is not None else None
+
+        full = prod(profile)
+        if full <= OrthogonalArray.MAX_RUNS and (best_runs is None or full <= best_runs):
+            array = [list(row) for row in product(*(range(1, level + 1) for level in profile))]
+            return f'L{full}', array, list(range(self.__num_factors))
+
+        if built:
+            array = build_orthogonal_array(self.__max_level, self.__num_factors, OrthogonalArray.MAX_RUNS)
+            return f'L{len(array)}', array, list(range(self.__num_factors))
+
+        if best is not None:
+            _, name, array, assignment = best
+            return name, array, assignment
+
         raise ValueError(f'No hay arreglo ortogonal para {self.__err_get_L()}')
+
+    def __get_array(self):
+        """
+        Retorna el arreglo ortogonal de los parámetros (ver `__get_orthogonal_array`) o, si no hay
+        ninguno, un arreglo de cubrimiento de fuerza 2 (todos los pares) construido con IPOG en a lo
+        sumo `COVERING_MAX_TIME` segundos y reducido durante `COVERING_IMPROVEMENT_TIME` segundos.
+
+        Returns:
+        --------
+        Tuple[str, list, list, bool] : El nombre del arreglo, sus filas (niveles desde 1), la columna de
+        cada parámetro y si es un arreglo de cubrimiento.
+
+        Raises:
+        -------
+        ValueError : Si no hay arreglo ortogonal y el de cubrimiento no se construye a tiempo.
+        """
+        try:
+            return self.__get_orthogonal_array() + (False,)
+        except ValueError as e:
+            profile = sorted((len(value) for value in self.__parameters.values()), reverse=True)
+            try:
+                rows = CoveringArray(profile).build_indexes(time_budget=OrthogonalArray.COVERING_IMPROVEMENT_TIME,
+                                                            max_time=OrthogonalArray.COVERING_MAX_TIME)
+            except TimeoutError:
+                raise ValueError(f'{e} y el arreglo de cubrimiento no se construyó en {OrthogonalArray.COVERING_MAX_TIME} segundos.')
+            return f'CA{len(rows)}', [[cell + 1 for cell in row] for row in rows], list(range(len(profile))), True
+
+    def __assign_columns(self, profile, columns):
+        """
+        Asigna a cada parámetro (en orden descendente de niveles) una columna con suficientes
+        niveles, tomando las columnas de mayor a menor número de niveles. Retorna None si no alcanzan.
+        """
+        order = sorted(range(len(columns)), key=lambda column: columns[column], reverse=True)
+        if len(order) < len(profile):
+            return None
+        for level, column in zip(profile, order):
+            if columns[column] < level:
+                return None
+        return order[:len(profile)]
      
     def __valide_parameteres(self):
         for key, value in self.__parameters.items():
@@ -56,7 +220,7 @@ class OrthogonalArray:
 
 
     def build_test_cases(self):
-        L, array =  self.__get_orthogonal_array()
+        L, array, assignment, covering =  self.__get_array()
 
         sorted_parameters = dict(sorted(self.__parameters.items(), key=lambda x: len(x[1]), reverse=True))
 
@@ -64,18 +228,46 @@ class OrthogonalArray:
         N, M = len(array), len(keys)
         test_cases = [[0 for _ in range(M)] for _ in range(N)]
         
+        # Si la columna tiene más niveles que valores el parámetro, los niveles sobrantes se colapsan
+        # a los valores con una función fija (nivel módulo número de valores), lo que conserva la
+        # ortogonalidad con frecuencias proporcionales
         for column, key in enumerate(keys):
             values = sorted_parameters[key]
-            queue = values.copy()
             for row in range(N):
-                idx = array[row][column] - 1
-                value = None
-                if -1 < idx < len(values): value = values[idx] 
-                else: value = queue[0]; queue = queue[1:] + [queue[0]]
-                test_cases[row][column] =  value
+                idx = array[row][assignment[column]] - 1
+                test_cases[row][column] = values[idx % len(values)]
 
-        return {
+        test_cases = {
             'L' : L,
             'keys' : keys,
             'array' : test_cases
         }
+        if covering:
+            test_cases['tipo'] = OrthogonalArray.COVERING_TYPE
+        return test_cases
+
+    def estimate(self):
+        """
+        Estima el resultado de `build_test_cases` sin construir la tabla de casos: el arreglo
+        ortogonal seleccionado, el número de casos (filas) y el tamaño aproximado en bytes de la
+        respuesta JSON. Si no hay arreglo ortogonal, el arreglo de cubrimiento sí se construye,
+        porque su número de filas no se conoce de antemano.
+
+        Returns:
+        --------
+        estimate : dict
+            Un diccionario con las claves 'L', 'casos' y 'bytes'.
+        """
+        L, array, _, covering = self.__get_array()
+        rows = len(array)
+
+        json_size = lambda value: len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        row_size = 2 + max(self.__num_factors - 1, 0)
+        for values in self.__parameters.values():
+            row_size += sum(json_size(value) for value in values) / len(values)
+
+        envelope = {'L' : L, 'keys' : list(self.__parameters.keys()), 'array' : []}
+        if covering:
+            envelope['tipo'] = OrthogonalArray.COVERING_TYPE
+        total = json_size(envelope) + rows * row_size + max(rows - 1, 0)
+        return {'L' : L, 'casos' : rows, 'bytes' : int(round(total))}
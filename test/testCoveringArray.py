@@ -0,0 +1,82 @@
+import sys
+import os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+import unittest
+from itertools import combinations, product
+from techniques.CoveringArray.coveringArray import CoveringArray
+
+
+class TestCoveringArray(unittest.TestCase):
+
+    def assertCovers(self, levels, strength, rows):
+        t = min(strength, len(levels))
+        for columns in combinations(range(len(levels)), t):
+            expected = set(product(*[range(levels[column]) for column in columns]))
+            covered = set(tuple(row[column] for column in columns) for row in rows)
+            self.assertTrue(expected <= covered, f'Combinaciones sin cubrir en {columns}')
+
+    def test_fuerza_invalida(self):
+        with self.assertRaises(ValueError):
+            CoveringArray([2, 2, 2], strength=0)
+
+    def test_niveles_invalidos(self):
+        with self.assertRaises(ValueError):
+            CoveringArray([2, None, 2])
+
+    def test_pares_1(self):
+        levels = [3, 3, 3, 3]
+        rows = CoveringArray(levels).build_indexes()
+        self.assertCovers(levels, 2, rows)
+        self.assertLess(len(rows), 3 ** 4)
+
+    def test_pares_niveles_mixtos(self):
+        levels = [2, 3, 4, 5, 3, 2]
+        rows = CoveringArray(levels).build_indexes()
+        self.assertCovers(levels, 2, rows)
+        for row in rows:
+            self.assertTrue(all(0 <= value < level for value, level in zip(row, levels)))
+
+    def test_fase_de_mejora(self):
+        levels = [3] * 20
+        rows = CoveringArray(levels).build_indexes()
+        improved = CoveringArray(levels).build_indexes(time_budget=1)
+        self.assertCovers(levels, 2, improved)
+        self.assertLessEqual(len(improved), len(rows))
+
+    def test_tiempo_maximo(self):
+        with self.assertRaises(TimeoutError):
+            CoveringArray([11] * 60).build_indexes(max_time=0.01)
+
+    def test_fuerza_3(self):
+        levels = [4] * 8
+        rows = CoveringArray(levels, strength=3).build_indexes()
+        self.assertCovers(levels, 3, rows)
+        self.assertLess(len(rows), 4 ** 8)
+
+    def test_menos_parametros_que_fuerza(self):
+        rows = CoveringArray([2, 3], strength=3).build_indexes()
+        self.assertEqual(len(rows), 6)
+
+    def test_conflictos(self):
+        levels = [3, 3, 2, 3]
+        conflicts = {(0, 0) : {(1, 1)}, (1, 1) : {(0, 0)}, (2, 1) : {(3, 2)}, (3, 2) : {(2, 1)}}
+        rows = CoveringArray(levels, conflicts=conflicts).build_indexes()
+        allowed = [row for row in product(*[range(level) for level in levels])
+                   if not (row[0] == 0 and row[1] == 1) and not (row[2] == 1 and row[3] == 2)]
+        for columns in combinations(range(len(levels)), 2):
+            expected = set(tuple(row[column] for column in columns) for row in allowed)
+            covered = set(tuple(row[column] for column in columns) for row in rows)
+            self.assertEqual(expected, covered)
+        self.assertTrue(all(tuple(row) in allowed for row in rows))
+
+    def test_muchos_parametros(self):
+        levels = [2] * 60
+        rows = CoveringArray(levels).build_indexes()
+        self.assertCovers(levels, 2, rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,9 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
+import json
 import unittest
+from itertools import combinations
 from techniques.EquivalencePartition.equivalencePartition import EquivalencePartition
 
 class TestEquivalencePartition(unittest.TestCase):
@@ -364,3 +366,331 @@ class TestEquivalencePartition(unittest.TestCase):
         self.assertEqual(test_cases_valids, expected_valids)
         self.assertEqual(test_cases_invalids, expected_invalids)
 
+
+    def test_generar_casos_de_prueba_cantidad_esperada_4(self):
+        #
+        # Caso de prueba con muchos parametros. (4^6 casos validos y 6 invalidos)
+        parameters = {}
+        for i in range(6):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(4)}
+            parameters[f'param{i + 1}']['invalida'] = {'valido': False, 'representante': -1}
+
+        ep = EquivalencePartition(parameters)
+        test_cases = ep.build_test_cases()
+        test_cases_valids = test_cases.get('casos_validos', [])
+        test_cases_invalids = test_cases.get('casos_invalidos', [])
+
+        self.assertEqual(len(test_cases_valids), 4 ** 6)
+        self.assertEqual(len(test_cases_invalids), 6)
+        self.assertEqual(test_cases_valids[-1]['param6'], {'clase_equivalencia': 'class3', 'representante': 3})
+
+    def test_iterar_casos_de_prueba(self):
+        #
+        # Los iteradores deben producir los mismos casos, en el mismo orden, que build_test_cases.
+        parameters = {
+            'edad': {
+                'menor_18': {'valido': False, 'representante': 10},
+                'entre_18_y_65': {'valido': True, 'representante': 30},
+                'mayor_65': {'valido': True, 'representante': 70}
+            },
+            'genero': {
+                'masculino': {'valido': True, 'representante': 'M'},
+                'femenino': {'valido': True, 'representante': 'F'},
+                'otro': {'valido': False, 'representante': 'O'}
+            }
+        }
+
+        ep = EquivalencePartition(parameters)
+        valids = ep.iter_valid_cases()
+        first_case = next(valids)
+        test_cases = ep.build_test_cases()
+
+        self.assertEqual(first_case, test_cases['casos_validos'][0])
+        self.assertEqual([first_case] + list(valids), test_cases['casos_validos'])
+        self.assertEqual(list(ep.iter_invalid_cases()), test_cases['casos_invalidos'])
+
+    def test_casos_de_prueba_por_indice(self):
+        #
+        # Los casos calculados por indice y los rangos deben coincidir con la lista completa.
+        parameters = {}
+        for i in range(4):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': j != 1, 'representante': j} for j in range(i + 2)}
+
+        ep = EquivalencePartition(parameters)
+        test_cases = ep.build_test_cases()
+        valids, invalids = test_cases['casos_validos'], test_cases['casos_invalidos']
+
+        self.assertEqual(ep.count(), {'casos_validos': len(valids), 'casos_invalidos': len(invalids)})
+        self.assertEqual([ep.get_valid_case(k) for k in range(len(valids))], valids)
+        self.assertEqual([ep.get_invalid_case(k) for k in range(len(invalids))], invalids)
+        self.assertEqual(list(ep.iter_valid_cases(start=5, stop=17)), valids[5:17])
+        self.assertEqual(list(ep.iter_valid_cases(start=20)), valids[20:])
+        with self.assertRaises(IndexError):
+            ep.get_valid_case(len(valids))
+
+    def test_generar_casos_de_prueba_combinatorio(self):
+        #
+        # En el modo combinatorio todos los pares de clases validas deben aparecer en algun caso.
+        parameters = {}
+        for i in range(5):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(3)}
+            parameters[f'param{i + 1}']['invalida'] = {'valido': False, 'representante': -1}
+
+        ep = EquivalencePartition(parameters)
+        test_cases = ep.build_test_cases(mode='combinatorio')
+        test_cases_valids = test_cases.get('casos_validos', [])
+
+        self.assertLess(len(test_cases_valids), 3 ** 5)
+        self.assertEqual(test_cases.get('casos_invalidos', []), list(ep.iter_invalid_cases()))
+        for first, second in [('param1', 'param2'), ('param2', 'param5'), ('param3', 'param4')]:
+            pairs = set((case[first]['clase_equivalencia'], case[second]['clase_equivalencia']) for case in test_cases_valids)
+            self.assertEqual(len(pairs), 9)
+
+        with self.assertRaises(ValueError):
+            ep.build_test_cases(mode='desconocido')
+
+    def test_generar_casos_invalidos_idempotente(self):
+        #
+        # Generar los casos varias veces debe producir la misma salida, con el parametro invalido como primera clave.
+        parameters = {
+            'param1': {'valida': {'valido': True, 'representante': 1}, 'invalida': {'valido': False, 'representante': -1}},
+            'param2': {'valida': {'valido': True, 'representante': 2}, 'invalida': {'valido': False, 'representante': -2}},
+            'param3': {'valida': {'valido': True, 'representante': 3}, 'invalida': {'valido': False, 'representante': -3}},
+        }
+
+        ep = EquivalencePartition(parameters)
+        first = ep.build_test_cases()
+        second = ep.build_test_cases()
+        invalids = first['casos_invalidos']
+
+        self.assertEqual(first, second)
+        self.assertEqual(list(first['casos_validos'][0].keys()), ['param1', 'param2', 'param3'])
+        self.assertEqual([list(case.keys()) for case in invalids],
+                         [['param1', 'param2', 'param3'], ['param2', 'param3', 'param1'], ['param3', 'param1', 'param2']])
+
+    def test_generar_casos_de_prueba_compactos(self):
+        #
+        # El formato compacto debe describir los mismos casos que el formato extendido.
+        parameters = {
+            'edad': {
+                'menor_18': {'valido': False, 'representante': 10},
+                'entre_18_y_65': {'valido': True, 'representante': 30},
+                'mayor_65': {'valido': True, 'representante': 70}
+            },
+            'salario': {
+                'menor_a_1000': {'valido': False, 'representante': 500},
+                'entre_1000_y_5000': {'valido': True, 'representante': 2000},
+                'mayor_a_5000': {'valido': False, 'representante': 8000}
+            }
+        }
+
+        ep = EquivalencePartition(parameters)
+        compact = ep.build_test_cases(compact=True)
+        test_cases = ep.build_test_cases()
+
+        def expand(row):
+            case = {}
+            for name, classes, index in zip(compact['parametros'], compact['clases'], row):
+                case[name] = {'clase_equivalencia': classes[index]['clase_equivalencia'], 'representante': classes[index]['representante']}
+            return case
+
+        self.assertEqual(compact['parametros'], ['edad', 'salario'])
+        self.assertEqual(compact['casos_validos'], [[1, 1], [2, 1]])
+        self.assertEqual(compact['casos_invalidos'], [[0, 1], [1, 0], [1, 2]])
+        self.assertEqual([expand(row) for row in compact['casos_validos']], test_cases['casos_validos'])
+        self.assertEqual([expand(row) for row in compact['casos_invalidos']], test_cases['casos_invalidos'])
+
+    def test_generar_casos_de_prueba_con_restricciones(self):
+        #
+        # Las combinaciones excluidas no deben generarse y se reporta cuantas se descartaron.
+        parameters = {
+            'pais': {
+                'AR': {'valido': True, 'representante': 'AR', 'requiere': {'moneda': ['ARS']}},
+                'US': {'valido': True, 'representante': 'US', 'excluye': {'moneda': ['ARS']}},
+                'XX': {'valido': False, 'representante': 'XX'}
+            },
+            'moneda': {
+                'ARS': {'valido': True, 'representante': 'ARS'},
+                'USD': {'valido': True, 'representante': 'USD'},
+                'EUR': {'valido': True, 'representante': 'EUR'}
+            },
+            'canal': {
+                'web': {'valido': True, 'representante': 'web'},
+                'app': {'valido': True, 'representante': 'app'}
+            }
+        }
+
+        ep = EquivalencePartition(parameters)
+        test_cases = ep.build_test_cases()
+        valids = test_cases['casos_validos']
+        combinations = [(case['pais']['clase_equivalencia'], case['moneda']['clase_equivalencia']) for case in valids]
+
+        self.assertEqual(combinations, [('AR', 'ARS'), ('AR', 'ARS'), ('US', 'USD'), ('US', 'USD'), ('US', 'EUR'), ('US', 'EUR')])
+        self.assertEqual(test_cases['casos_descartados'], 6)
+        self.assertEqual(len(test_cases['casos_invalidos']), 1)
+        self.assertEqual(ep.count(), {'casos_validos': 6, 'casos_invalidos': 1, 'casos_descartados': 6})
+        self.assertEqual([ep.get_valid_case(k) for k in range(6)], valids)
+        self.assertEqual(list(ep.iter_valid_cases(start=2, stop=4)), valids[2:4])
+
+    def test_generar_casos_de_prueba_combinatorio_con_restricciones(self):
+        #
+        # Con restricciones el modo combinatorio debe cubrir todos los pares de clases que aparecen en alguna combinacion permitida.
+        parameters = {}
+        for i in range(6):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(3)}
+        parameters['param1']['class0']['excluye'] = {'param2': ['class1', 'class2']}
+        parameters['param3']['class2']['excluye'] = {'param4': ['class0']}
+        parameters['param5']['class1']['requiere'] = {'param6': ['class2']}
+
+        ep = EquivalencePartition(parameters)
+        allowed = ep.build_test_cases()['casos_validos']
+        valids = ep.build_test_cases(mode='combinatorio')['casos_validos']
+
+        self.assertTrue(all(case in allowed for case in valids))
+        for first, second in combinations(parameters, 2):
+            pairs = lambda cases: set((case[first]['clase_equivalencia'], case[second]['clase_equivalencia']) for case in cases)
+            self.assertEqual(pairs(valids), pairs(allowed))
+
+    def test_casos_invalidos_con_restricciones(self):
+        #
+        # Los demas parametros de un caso invalido deben tomar la primera clase valida compatible.
+        parameters = {
+            'pais': {
+                'AR': {'valido': True, 'representante': 'AR'},
+                'XX': {'valido': False, 'representante': 'XX', 'excluye': {'moneda': ['ARS']}}
+            },
+            'moneda': {
+                'ARS': {'valido': True, 'representante': 'ARS'},
+                'USD': {'valido': True, 'representante': 'USD'},
+                'ZZZ': {'valido': False, 'representante': 'ZZZ'}
+            }
+        }
+
+        ep = EquivalencePartition(parameters)
+        invalids = ep.build_test_cases()['casos_invalidos']
+
+        self.assertEqual([(case['pais']['clase_equivalencia'], case['moneda']['clase_equivalencia']) for case in invalids],
+                         [('XX', 'USD'), ('AR', 'ZZZ')])
+        self.assertEqual([ep.get_invalid_case(k) for k in range(2)], invalids)
+        self.assertEqual(ep.build_test_cases(compact=True)['casos_invalidos'], [[1, 1], [0, 2]])
+
+    def test_restriccion_invalida(self):
+        #
+        # Caso de prueba cuando una restriccion hace referencia a una clase que no existe.
+        parameters = {
+            'pais': {'AR': {'valido': True, 'representante': 'AR', 'excluye': {'moneda': ['JPY']}}},
+            'moneda': {'ARS': {'valido': True, 'representante': 'ARS'}}
+        }
+
+        with self.assertRaises(AssertionError):
+            EquivalencePartition(parameters)
+
+    def test_estimar_casos_de_prueba(self):
+        #
+        # La estimacion debe coincidir con el numero de casos generados y aproximar el tamano de la respuesta.
+        parameters = {}
+        for i in range(4):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': j != 0, 'representante': f'valor{j}'} for j in range(i + 2)}
+
+        ep = EquivalencePartition(parameters)
+        for options in [{}, {'compact': True}, {'mode': 'combinatorio'}]:
+            estimate = ep.estimate(**options)
+            test_cases = ep.build_test_cases(**options)
+            size = len(json.dumps(test_cases, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+            self.assertEqual(estimate['casos_validos'], len(test_cases['casos_validos']))
+            self.assertEqual(estimate['casos_invalidos'], len(test_cases['casos_invalidos']))
+            self.assertAlmostEqual(estimate['bytes'] / size, 1, delta=0.1)
+
+    def test_estimar_casos_de_prueba_con_restricciones_grandes(self):
+        #
+        # Con restricciones el numero de casos se cuenta sin recorrer las combinaciones permitidas.
+        parameters = {}
+        for i in range(9):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(6)}
+        parameters['param1']['class0']['excluye'] = {'param9': ['class1']}
+
+        estimate = EquivalencePartition(parameters).estimate()
+        self.assertEqual(estimate['casos_validos'], 6 ** 9 - 6 ** 7)
+        self.assertNotIn('aproximado', estimate)
+
+        #
+        # Si el conteo es demasiado costoso se retorna el producto sin restricciones como cota superior.
+        parameters = {}
+        for i in range(24):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(10)}
+        for i in range(12):
+            for j in range(10):
+                parameters[f'param{i + 1}'][f'class{j}']['excluye'] = {f'param{i + 13}': [f'class{j}']}
+
+        ep = EquivalencePartition(parameters)
+        self.assertEqual(ep.count(), {'casos_validos': 10 ** 24, 'casos_invalidos': 0, 'aproximado': True})
+        self.assertTrue(ep.estimate()['aproximado'])
+        self.assertNotIn('aproximado', ep.estimate(mode='muestreo', sample_size=10))
+
+    def test_generar_casos_de_prueba_en_paralelo(self):
+        #
+        # La generacion en varios procesos debe producir los mismos casos, en el mismo orden.
+        parameters = {}
+        for i in range(5):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(3)}
+
+        ep = EquivalencePartition(parameters)
+        expected = ep.build_test_cases()
+
+        min_cases = EquivalencePartition.PARALLEL_MIN_CASES
+        EquivalencePartition.PARALLEL_MIN_CASES = 0
+        try:
+            test_cases = ep.build_test_cases(workers=2)
+        finally:
+            EquivalencePartition.PARALLEL_MIN_CASES = min_cases
+
+        self.assertEqual(test_cases, expected)
+        with self.assertRaises(ValueError):
+            ep.build_test_cases(workers=0)
+
+    def test_generar_casos_de_prueba_muestreo(self):
+        #
+        # La muestra debe ser reproducible, sin repetidos y tomada del producto completo.
+        parameters = {}
+        for i in range(6):
+            parameters[f'param{i + 1}'] = {f'class{j}': {'valido': True, 'representante': j} for j in range(4)}
+            parameters[f'param{i + 1}']['invalida'] = {'valido': False, 'representante': -1}
+
+        ep = EquivalencePartition(parameters)
+        all_cases = ep.build_test_cases()
+        first = ep.build_test_cases(mode='muestreo', sample_size=50, seed=7)
+        second = ep.build_test_cases(mode='muestreo', sample_size=50, seed=7)
+        other = ep.build_test_cases(mode='muestreo', sample_size=50, seed=8)
+        valids = first['casos_validos']
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(valids, other['casos_validos'])
+        self.assertEqual(len(valids), 50)
+        self.assertEqual(first['casos_invalidos'], all_cases['casos_invalidos'])
+        positions = [all_cases['casos_validos'].index(case) for case in valids]
+        self.assertEqual(positions, sorted(set(positions)))
+        self.assertEqual(len(ep.build_test_cases(mode='muestreo', sample_size=10000, seed=7)['casos_validos']), 4 ** 6)
+
+    def test_generar_casos_de_prueba_muestreo_con_restricciones(self):
+        #
+        # Con restricciones la muestra solo debe contener combinaciones permitidas.
+        parameters = {
+            'pais': {
+                'AR': {'valido': True, 'representante': 'AR', 'requiere': {'moneda': ['ARS']}},
+                'US': {'valido': True, 'representante': 'US', 'excluye': {'moneda': ['ARS']}}
+            },
+            'moneda': {
+                'ARS': {'valido': True, 'representante': 'ARS'},
+                'USD': {'valido': True, 'representante': 'USD'},
+                'EUR': {'valido': True, 'representante': 'EUR'}
+            }
+        }
+
+        ep = EquivalencePartition(parameters)
+        allowed = ep.build_test_cases()['casos_validos']
+        for size in range(5):
+            valids = ep.build_test_cases(mode='muestreo', sample_size=size, seed=1)['casos_validos']
+            self.assertEqual(len(valids), min(size, len(allowed)))
+            self.assertEqual(ep.estimate(mode='muestreo', sample_size=size)['casos_validos'], len(valids))
+            self.assertTrue(all(case in allowed for case in valids))
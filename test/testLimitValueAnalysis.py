@@ -5,7 +5,10 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
 import unittest
-from techniques.LimitValueAnalysis.limitValueAnalysis import LimitValueAnalysis
+from concurrent.futures import ThreadPoolExecutor
+from techniques.LimitValueAnalysis.limitValueAnalysis import LimitValueAnalysis, TimeoutException, np
+from techniques.LimitValueAnalysis.expression import Expression
+from techniques.LimitValueAnalysis.cache import LimitCache
 
 
 class TestLimitValueAnalysis(unittest.TestCase) :
@@ -55,6 +58,25 @@ class TestLimitValueAnalysis(unittest.TestCase) :
             LimitValueAnalysis(parameters)
 
 
+    def test_parametro_invalido_lambda_no_permitido(self):
+        #
+        # Caso de prueba cuando el `lambda` intenta ejecutar codigo que no es una restriccion.
+        parameters = {
+            'param1' : {'lambda' : "__import__('os').getcwd() and 0<x<10", 'delta' : 1}
+        }
+        
+        with self.assertRaises(SyntaxError):
+            LimitValueAnalysis(parameters)
+
+    def test_parametro_invalido_lambda_potencia(self):
+        #
+        # Caso de prueba cuando el `lambda` usa exponentes que no son constantes pequenas.
+        for lambda_str in ['0<x<9**9**9', '0<x<9^9^9', '2^x>3', '(x^10)^20>1']:
+            with self.assertRaises(SyntaxError):
+                LimitValueAnalysis({'param1' : {'lambda' : lambda_str, 'delta' : 1}})
+
+        self.assertTrue(Expression('x^2>4 and x<10^6')(3))
+
     def test_parametro_invalido_lambda_type(self):
         #
         # Caso de prueba cuando el `lambda` esta mal escrito. (param2 :  X mayuscula)
@@ -194,7 +216,7 @@ class TestLimitValueAnalysis(unittest.TestCase) :
 
         analysis = LimitValueAnalysis(parameters)
         limits = analysis.build_limits()
-        test_cases = analysis.build_test_cases()
+        test_cases = analysis.build_test_cases(strategy='producto')
         n_valids = len(test_cases.get('casos_validos', 0))
         n_invalids = len(test_cases.get('casos_invalidos', 0))
 
@@ -202,18 +224,281 @@ class TestLimitValueAnalysis(unittest.TestCase) :
         self.assertEqual(n_valids, 125)
         self.assertEqual(n_invalids, 6)
         
+    def test_generar_casos_estandar_y_robusto(self):
+        #
+        # La suite estandar tiene 4n+1 casos y la robusta agrega 2n casos invalidos
+        parameters = {
+            'param1' : {'lambda' : '-1.2<x<=4.3', 'delta' : 0.1},
+            'param2' : {'lambda' : '1<=x<=10^6 and x%10000!=0', 'delta' : 10},
+            'param3' : {'lambda' : '10<=x<=100 and x%2==0', 'delta' : 1}
+        }
+
+        analysis = LimitValueAnalysis(parameters)
+        standard = analysis.build_test_cases()
+        robust = analysis.build_test_cases(strategy='robusto')
+
+        self.assertEqual((len(standard['casos_validos']), len(standard['casos_invalidos'])), (13, 0))
+        self.assertEqual((len(robust['casos_validos']), len(robust['casos_invalidos'])), (13, 6))
+        self.assertEqual(standard['casos_validos'][0]['param1'], {'clase_equivalencia' : 'valor_medio', 'representante' : 1.0})
+        self.assertEqual(robust['casos_invalidos'][0], {
+            'param1' : {'clase_equivalencia' : 'valor_minimo_invalido', 'representante' : -1.2},
+            'param2' : {'clase_equivalencia' : 'valor_medio', 'representante' : 499990},
+            'param3' : {'clase_equivalencia' : 'valor_medio', 'representante' : 54}
+        })
+        self.assertEqual(analysis.estimate(strategy='robusto')['casos_invalidos'], 6)
+        with self.assertRaises(ValueError):
+            analysis.build_test_cases(strategy='desconocida')
+
+    def test_generar_casos_ortogonal(self):
+        #
+        # Los valores limite validos se combinan con un arreglo ortogonal (5 niveles -> L25)
+        parameters = {
+            'param1' : {'lambda' : '-1.2<x<=4.3', 'delta' : 0.1},
+            'param2' : {'lambda' : '0<x<100', 'delta' : 1},
+            'param3' : {'lambda' : '10<=x<=100 and x%2==0', 'delta' : 1}
+        }
+
+        analysis = LimitValueAnalysis(parameters)
+        test_cases = analysis.build_test_cases(strategy='ortogonal')
+
+        self.assertEqual(test_cases['L'], 'L25')
+        self.assertEqual(len(test_cases['casos_validos']), 25)
+        self.assertEqual(len(test_cases['casos_invalidos']), 6)
+        pairs = {(case['param1']['clase_equivalencia'], case['param2']['clase_equivalencia']) for case in test_cases['casos_validos']}
+        self.assertEqual(len(pairs), 25)
+        self.assertEqual(analysis.estimate(strategy='ortogonal')['casos_validos'], 25)
+
+    def test_estimar_casos_de_prueba(self):
+        #
+        # La estimacion no recorre la malla pero debe dar el numero exacto de casos.
+        parameters = {
+            'param1' : {'lambda' : '-1.2<x<=4.3', 'delta' : 0.1},
+            'param2' : {'lambda' : '1<=x<=10^6 and x%10000!=0', 'delta' : 10},
+            'param3' : {'lambda' : '10<=x<=100 and x%2==0', 'delta' : 1}
+        }
+
+        estimate = LimitValueAnalysis(parameters).estimate(strategy='producto')
+
+        self.assertEqual(estimate['casos_validos'], 125)
+        self.assertEqual(estimate['casos_invalidos'], 6)
+        self.assertGreater(estimate['bytes'], 0)
+
+    def test_generar_limites_intervalo_amplio(self):
+        #
+        # Las restricciones con forma de intervalo se resuelven sin recorrer el rango
+        parameters = {
+            'param1' : {'lambda' : '0<x<1000000', 'delta' : 0.01},
+            'param2' : {'lambda' : 'x>=-1000000000 and x<1000000000', 'delta' : 1}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual(limits['param1'], {
+            'valor_minimo_invalido': 0.0, 'primer_valor_minimo': 0.01, 'segundo_valor_minimo': 0.02,
+            'valor_medio': 500000.0, 'primer_valor_maximo': 999999.98, 'segundo_valor_maximo': 999999.99,
+            'valor_maximo_invalido': 1000000.0
+        })
+        self.assertEqual(limits['param2'], {
+            'valor_minimo_invalido': -1000000001, 'primer_valor_minimo': -1000000000, 'segundo_valor_minimo': -999999999,
+            'valor_medio': -1, 'primer_valor_maximo': 999999998, 'segundo_valor_maximo': 999999999,
+            'valor_maximo_invalido': 1000000000
+        })
+
+    def test_generar_limites_varios_intervalos(self):
+        #
+        # Cada intervalo de la restriccion tiene sus propios valores limite, incluidos los interiores
+        parameters = {
+            'param1' : {'lambda' : '(0<x<10) or (20<x<30)', 'delta' : 1},
+            'param2' : {'lambda' : '0<x<10', 'delta' : 1}
+        }
+
+        analysis = LimitValueAnalysis(parameters)
+        limits = analysis.build_limits()
+
+        self.assertEqual(limits['param1'], {
+            'valor_minimo_invalido_1': 0, 'primer_valor_minimo_1': 1, 'segundo_valor_minimo_1': 2,
+            'valor_medio_1': 5, 'primer_valor_maximo_1': 8, 'segundo_valor_maximo_1': 9, 'valor_maximo_invalido_1': 10,
+            'valor_minimo_invalido_2': 20, 'primer_valor_minimo_2': 21, 'segundo_valor_minimo_2': 22,
+            'valor_medio_2': 25, 'primer_valor_maximo_2': 28, 'segundo_valor_maximo_2': 29, 'valor_maximo_invalido_2': 30
+        })
+        self.assertIn('primer_valor_minimo', limits['param2'])
+
+        estimate = analysis.estimate(strategy='producto')
+        self.assertEqual(estimate['casos_validos'], 10 * 5)
+        self.assertEqual(estimate['casos_invalidos'], 4 + 2)
+
+    def test_generar_limites_intervalos_contiguos_y_puntuales(self):
+        #
+        # Los intervalos sin un punto invalido de la malla entre ellos se unen y los de un solo punto se omiten
+        parameters = {
+            'param1' : {'lambda' : '(0<=x<=10) or (11<=x<=20) or (30<x<40)', 'delta' : 1},
+            'param2' : {'lambda' : '(0<x<10) or (20<x<30) or x==35', 'delta' : 1}
+        }
+
+        analysis = LimitValueAnalysis(parameters)
+        limits = analysis.build_limits()
+
+        self.assertEqual((limits['param1']['valor_maximo_invalido_1'], limits['param1']['valor_minimo_invalido_2']), (21, 30))
+        self.assertNotIn('primer_valor_minimo_3', limits['param1'])
+        self.assertNotIn('primer_valor_minimo_3', limits['param2'])
+        self.assertNotIn(None, limits['param2'].values())
+
+        for strategy in ['robusto', 'producto']:
+            test_cases = analysis.build_test_cases(strategy=strategy)
+            estimate = analysis.estimate(strategy=strategy)
+            self.assertEqual(estimate['casos_validos'], len(test_cases['casos_validos']))
+            self.assertEqual(estimate['casos_invalidos'], len(test_cases['casos_invalidos']))
+
+    def test_generar_limites_biseccion(self):
+        #
+        # Las restricciones sin forma de intervalo ni patrones periodicos se resuelven por biseccion
+        parameters = {
+            'param1' : {'lambda' : 'x*x-3*x<40 and x>=-100 and x<=100', 'delta' : 0.01},
+            'param2' : {'lambda' : '0<=x<=10^9 and x*x-3*x>40', 'delta' : 0.001}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual(limits['param1'], {
+            'valor_minimo_invalido': -5.0, 'primer_valor_minimo': -4.99, 'segundo_valor_minimo': -4.98,
+            'valor_medio': 1.0, 'primer_valor_maximo': 7.98, 'segundo_valor_maximo': 7.99,
+            'valor_maximo_invalido': 8.0
+        })
+        self.assertEqual(limits['param2']['primer_valor_minimo'], 8.001)
+        self.assertEqual(limits['param2']['segundo_valor_maximo'], 1000000000)
+
+    def test_generar_limites_biseccion_regiones_angostas(self):
+        #
+        # Las regiones validas mas angostas que el rango no se pierden al bisecar
+        parameters = {
+            'param1' : {'lambda' : 'abs(x-3.3)<0.05 and x>-100 and x<100', 'delta' : 0.01},
+            'param2' : {'lambda' : 'x>-100 and x<100 and (x*x-10*x+24.999<0 or x>90)', 'delta' : 0.01}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual((limits['param1']['primer_valor_minimo'], limits['param1']['segundo_valor_maximo']), (3.25, 3.34))
+        self.assertEqual(limits['param2']['primer_valor_minimo'], 4.97)
+        self.assertEqual(limits['param2']['valor_medio'], 5.03)
+        self.assertEqual(Expression('x*x<2 and x>0').holds(0.5, 1.4), True)
+        self.assertEqual(Expression('x*x-10*x+24.999<0').holds(20, 21), False)
+        self.assertIsNone(Expression('x*x-10*x+24.999<0').holds(0, 10))
+
+    def test_generar_limites_malla_decimal(self):
+        #
+        # Los pasos decimales no acumulan error y el delta puede estar en notacion cientifica
+        parameters = {
+            'param1' : {'lambda' : '0<=x<=3 and x%0.5!=0', 'delta' : 0.1},
+            'param2' : {'lambda' : '0<x<0.001', 'delta' : 1e-05}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual(limits['param1'], {
+            'valor_minimo_invalido': 0.0, 'primer_valor_minimo': 0.1, 'segundo_valor_minimo': 0.2,
+            'valor_medio': 0.9, 'primer_valor_maximo': 2.8, 'segundo_valor_maximo': 2.9,
+            'valor_maximo_invalido': 3.0
+        })
+        self.assertEqual(limits['param2']['primer_valor_minimo'], 0.00001)
+        self.assertEqual(limits['param2']['segundo_valor_maximo'], 0.00099)
+
+    def test_cache_de_limites(self):
+        #
+        # Las restricciones repetidas (aunque cambien los espacios) se toman del cache
+        LimitValueAnalysis.CACHE.clear()
+        first = LimitValueAnalysis({'param1' : {'lambda' : '18<=x<=65', 'delta' : 1}}).build_limits()
+        second = LimitValueAnalysis({'param2' : {'lambda' : ' 18 <= x <= 65 ', 'delta' : 1}}).build_limits()
+        LimitValueAnalysis({'param1' : {'lambda' : '18<=x<=65', 'delta' : 1.0}}).build_limits()
+
+        self.assertEqual(first['param1'], second['param2'])
+        self.assertIsNot(first['param1'], second['param2'])
+        stats = LimitValueAnalysis.CACHE.stats()
+        self.assertEqual((stats['aciertos'], stats['fallos'], stats['entradas']), (1, 2, 2))
+
+    def test_cache_de_limites_lru(self):
+        #
+        # Al superar la capacidad se desaloja la entrada usada hace mas tiempo
+        cache = LimitCache(max_size=2)
+        cache.put('a', {'valor' : 1})
+        cache.put('b', {'valor' : 2})
+        cache.get('a')
+        cache.put('c', {'valor' : 3})
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'valor' : 1})
+        self.assertEqual(cache.stats()['desalojos'], 1)
+
+    @unittest.skipIf(np is None, 'NumPy no esta instalado')
+    def test_expresion_vectorizada(self):
+        #
+        # La expresion vectorizada debe coincidir con la evaluacion punto a punto
+        values = np.arange(-50, 50) / 4
+        for lambda_str in ['-5<x<=7.5 and x%2!=0', 'not (x>3 or x<-3) or x//5==1', 'abs(x)>2 and 1',
+                           '0<=x<=20 and x%4==(x>10)+(x>12)', '(x>1)+(x>2)==2 and 0<x<10',
+                           '0<x<10 and -(x>3)!=0', '(x>2)-(x>5)==1', 'abs(-(x>1))+(not x>3)*2==3']:
+            Fn = Expression(lambda_str)
+            expected = [bool(Fn(value)) for value in values.tolist()]
+            self.assertEqual(np.broadcast_to(Fn.vectorized()(values), values.shape).tolist(), expected)
+
+        #
+        # El valor de un and/or que no es booleano no se puede vectorizar
+        self.assertIsNone(Expression('(x>1 and 5)+1==6').vectorized())
+
+    def test_generar_limites_booleanos_como_numeros(self):
+        #
+        # Las comparaciones usadas como numeros valen 0 o 1, como en Python
+        parameters = {
+            'param1' : {'lambda' : '0<=x<=20 and x%4==(x>10)+(x>12)', 'delta' : 0.5},
+            'param2' : {'lambda' : '(x>2)-(x>5)==1', 'delta' : 0.5}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual(limits['param1']['primer_valor_maximo'], 14)
+        self.assertEqual(limits['param1']['segundo_valor_maximo'], 18)
+        self.assertEqual(limits['param2']['primer_valor_minimo'], 2.5)
+        self.assertEqual(limits['param2']['segundo_valor_maximo'], 5)
+
+    def test_generar_limites_enteros_grandes(self):
+        #
+        # Los resultados no dependen de NumPy aunque los valores intermedios no quepan en 64 bits
+        parameters = {
+            'param1' : {'lambda' : 'x>=3037000000 and x<=3037000600 and (x*x)//x==x', 'delta' : 1}
+        }
+
+        limits = LimitValueAnalysis(parameters).build_limits()
+
+        self.assertEqual(limits['param1']['segundo_valor_maximo'], 3037000600)
+        self.assertEqual(limits['param1']['valor_medio'], 3037000300)
+        self.assertGreater(Expression('x*x%10==9').magnitude(0, 3037000600), 2 ** 63)
+
     def test_generar_limites_timelimit(self):
 
         #
         # Caso de prueba cuando el algoritmo tarda demasiado en encontrar los limites
         parameters = {
-            'param1' : {'lambda' : 'x >= 1 and x <= 1000000000000 and x % 100000 == 0', 'delta' : 0.1}
+            'param1' : {'lambda' : 'x >= 1 and x <= 1000000000000 and x % 1000000000 == 0', 'delta' : 0.1}
         }
 
         analysis = LimitValueAnalysis(parameters)
         with self.assertRaises(Exception):
             analysis.build_limits()
-        
+
+    def test_generar_limites_timelimit_en_hilo(self):
+
+        #
+        # El limite de tiempo no usa señales, por lo que funciona fuera del hilo principal
+        parameters = {
+            'param1' : {'lambda' : 'x >= 1 and x <= 1000000000000 and x % 1000000000 == 0', 'delta' : 0.1}
+        }
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            slow = executor.submit(LimitValueAnalysis(parameters).build_limits, 0.5)
+            fast = executor.submit(LimitValueAnalysis({'param1' : {'lambda' : '0<x<100', 'delta' : 1}}).build_limits, 0.5)
+            with self.assertRaises(TimeoutException):
+                slow.result()
+            self.assertEqual(fast.result()['param1']['primer_valor_minimo'], 1)
+
 
 if __name__ == '__main__':
     unittest.main()
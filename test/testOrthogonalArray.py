@@ -4,8 +4,10 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
+import json
 import unittest
 from techniques.OrthogonalArray.orthogonalArray import OrthogonalArray
+from techniques.OrthogonalArray.arrays import PackedArray
 
 
 class TestOrthogonalArray(unittest.TestCase):
@@ -63,9 +65,19 @@ class TestOrthogonalArray(unittest.TestCase):
         for i in range(max_parameters):
             parameters[f'param{i + 1}'] = [ i + value for value in range(max_values)]
 
-        with self.assertRaises(ValueError):
-            oa = OrthogonalArray(parameters)
-            oa.build_test_cases()
+        #
+        # Sin arreglo ortogonal se genera un arreglo de cubrimiento con todos los pares
+        oa = OrthogonalArray(parameters)
+        result = oa.build_test_cases()
+        rows = result['array']
+
+        self.assertEqual(result['tipo'], OrthogonalArray.COVERING_TYPE)
+        self.assertEqual(result['L'], f'CA{len(rows)}')
+        self.assertLess(len(rows), 200)
+        for i in range(max_parameters):
+            for j in range(i + 1, max_parameters):
+                self.assertEqual(len({(row[i], row[j]) for row in rows}), max_values * max_values)
+        self.assertEqual(oa.estimate()['casos'], len(rows))
 
 
     def test_array_L4_1(self):
@@ -209,14 +221,14 @@ class TestOrthogonalArray(unittest.TestCase):
         expected_keys = ['param1', 'param2', 'param3', 'param4']
         expected_array = [
             ['A', 1, '%', 'P'], 
-            ['B', 2, '#', 'Q'], 
-            ['C', 3, '$', 'R'], 
-            ['A', 2, '$', 'P'], 
+            ['B', 2, '#', 'P'], 
+            ['C', 3, '$', 'P'], 
+            ['A', 2, '$', 'Q'], 
             ['B', 3, '%', 'Q'], 
-            ['C', 1, '#', 'R'], 
+            ['C', 1, '#', 'Q'], 
             ['A', 3, '#', 'R'], 
-            ['B', 1, '$', 'P'], 
-            ['C', 2, '%', 'Q']
+            ['B', 1, '$', 'R'], 
+            ['C', 2, '%', 'R']
         ]
     
         output = oa.build_test_cases()
@@ -269,3 +281,104 @@ class TestOrthogonalArray(unittest.TestCase):
         self.assertEqual(array, expected_array)
         self.assertEqual(keys, expected_keys)
         self.assertEqual(L, expected_L)
+
+    def test_arreglo_construido(self):
+        #
+        # Sin arreglo en el catalogo se construye uno (40 factores de 2 niveles -> L64)
+        parameters = {f'param{i + 1}' : ['A', 'B'] for i in range(40)}
+
+        result = OrthogonalArray(parameters).build_test_cases()
+
+        self.assertEqual(result['L'], 'L64')
+        self.assertEqual(len(result['array']), 64)
+        for i in range(40):
+            for j in range(i + 1, 40):
+                pairs = [(row[i], row[j]) for row in result['array']]
+                self.assertEqual(sorted(set(pairs)), [('A', 'A'), ('A', 'B'), ('B', 'A'), ('B', 'B')])
+                self.assertEqual(pairs.count(('A', 'B')), 16)
+
+    def test_arreglo_construido_niveles_no_primos(self):
+        #
+        # 6 niveles se construyen sobre GF(7) y se colapsan, conservando todos los pares
+        parameters = {f'param{i + 1}' : list(range(6)) for i in range(4)}
+
+        result = OrthogonalArray(parameters).build_test_cases()
+
+        self.assertEqual(result['L'], 'L49')
+        for i in range(4):
+            for j in range(i + 1, 4):
+                self.assertEqual(len({(row[i], row[j]) for row in result['array']}), 36)
+
+    def test_seleccion_menor_numero_de_filas(self):
+        #
+        # Se elige el arreglo con menos filas que aloja el perfil, aunque tenga mas niveles
+        profiles = [([2] * 12, 'L16'), ([3] * 5, 'L16B'), ([2] + [3] * 7, 'L18'), ([3] * 8, 'L27')]
+
+        for profile, expected_L in profiles:
+            parameters = {f'param{i + 1}' : list(range(levels)) for i, levels in enumerate(profile)}
+            self.assertEqual(OrthogonalArray(parameters).estimate()['L'], expected_L)
+
+    def test_seleccion_producto_cartesiano(self):
+        #
+        # Con uno o dos parametros el producto cartesiano no tiene mas filas que un arreglo construido
+        profiles = [([1000], 'L1000'), ([30, 30], 'L900'), ([3, 3], 'L9')]
+
+        for profile, expected_L in profiles:
+            parameters = {f'param{i + 1}' : list(range(levels)) for i, levels in enumerate(profile)}
+            result = OrthogonalArray(parameters).build_test_cases()
+
+            self.assertEqual(result['L'], expected_L)
+            self.assertEqual(len({tuple(row) for row in result['array']}), len(result['array']))
+
+    def test_arreglo_mixto(self):
+        #
+        # 4^1 x 2^4 cabe en L8 fusionando dos columnas (y su interaccion) en una de 4 niveles,
+        # y 2^1 x 3^7 usa la tabla mixta L18; todos los pares quedan balanceados
+        profiles = [([4, 2, 2, 2, 2], 'L8'), ([2] + [3] * 7, 'L18'), ([3, 2, 2, 2], 'L8')]
+
+        for profile, expected_L in profiles:
+            parameters = {f'param{i + 1}' : list(range(levels)) for i, levels in enumerate(profile)}
+            result = OrthogonalArray(parameters).build_test_cases()
+            rows = result['array']
+
+            self.assertEqual(result['L'], expected_L)
+            for i in range(len(profile)):
+                for j in range(i + 1, len(profile)):
+                    for a in set(row[i] for row in rows):
+                        for b in set(row[j] for row in rows):
+                            count_a = sum(1 for row in rows if row[i] == a)
+                            count_b = sum(1 for row in rows if row[j] == b)
+                            count_ab = sum(1 for row in rows if row[i] == a and row[j] == b)
+                            self.assertEqual(count_ab * len(rows), count_a * count_b)
+
+    def test_estimar_L8(self):
+        
+        parameters = {
+            'param1' : ['A', 'B'],
+            'param2' : [1, 2],
+            'param3' : ['%', '#'],
+            'param4' : ['P', 'Q'],
+            'param5' : ['X', 'Y']
+        }
+
+        oa = OrthogonalArray(parameters)
+        estimate = oa.estimate()
+
+        self.assertEqual(estimate['L'], 'L8')
+        self.assertEqual(estimate['casos'], 8)
+        self.assertEqual(estimate['bytes'], len(json.dumps(oa.build_test_cases(), separators=(',', ':'))))
+
+
+    def test_tabla_compacta(self):
+
+        table = PackedArray(levels=3, factors=2, columns=(3, 2), cells='1121323132')
+
+        #
+        # La tabla no se decodifica hasta que se usa
+        self.assertEqual(table.runs, 5)
+        self.assertIsNone(table._PackedArray__array)
+
+        self.assertEqual([list(row) for row in table.array], [[1, 1], [2, 1], [3, 2], [3, 1], [3, 2]])
+        self.assertIs(table.array, table.array)
+        with self.assertRaises(TypeError):
+            table.array[0][0] = 2